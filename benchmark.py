@@ -0,0 +1,484 @@
+"""Offline benchmarks for the Summarizer, run against a local stand-in server.
+
+A fixture corpus (home page, topic listings, articles and comment counts) is
+recorded once from Real Python:
+
+    python benchmark.py record advanced docker
+
+and then replayed by a local HTTP server, with configurable latency, jitter and
+"429 Too Many Requests" responses, while a full crawl and two incremental
+crawls are timed (the first incremental crawl after a full one, and then a
+steady-state one):
+
+    python benchmark.py run --latency 50 --jitter 20 --throttle 0.02 -w 8
+
+Each crawl runs in a fresh process (and a fresh working directory), so its
+caches start cold and its peak RSS is its own.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Local imports are deferred, so that recording and serving do not depend on
+# them; crawls run in their own working directory (for the caches).
+
+CORPUS_INDEX = "index.json"
+
+SCENARIOS = ("full", "incremental")
+
+# (name, scenario) of each crawl of a benchmark run, in order; each crawl
+# continues from the state left by the previous ones
+RUNS = (
+    ("full", "full"),
+    ("first incremental", "incremental"),
+    ("incremental", "incremental"),
+)
+
+
+def corpus_key(url: str) -> str:
+    """Key of `url` in the corpus index (the host is not recorded)."""
+    parts = urlsplit(url)
+    return (parts.path or "/") + ("?" + parts.query if parts.query else "")
+
+
+def record_corpus(selected_topics, corpus_dir, include_premium=True):
+    """Crawl Real Python and save every page needed to replay the crawl."""
+    import disqus
+    import summarizer
+
+    pages = {}
+    comment_counts = {}
+    lock = threading.Lock()
+
+    def record(url, response):
+        if url.startswith(disqus.DISQUS_URL):
+            counts = disqus.extract_comment_counts(response)
+            with lock:
+                comment_counts.update(counts)
+            return
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest() + ".html"
+        with open(os.path.join(corpus_dir, name), "wb") as f:
+            f.write(response.content)
+        content_type = response.headers.get("Content-Type", "text/html")
+        with lock:
+            pages[corpus_key(url)] = {"file": name, "content_type": content_type}
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    s = summarizer.Summarizer(
+        selected_topics=selected_topics, include_premium=include_premium, eager=True
+    )
+    record(s._BASE_URL, s.get_response(s._BASE_URL))
+
+    get_response = s.get_response
+
+    def recording_get_response(url, **kwargs):
+        response = get_response(url, **kwargs)
+        record(url, response)
+        return response
+
+    s.get_response = recording_get_response
+    s.comment_counts = disqus.CommentCounts(recording_get_response)
+
+    for topic in s.topics:
+        for tutorial in topic.tutorials:
+            tutorial.markdown_introduction
+            if tutorial.has_metadata_string:
+                tutorial.markdown_metadata_string
+
+    index = {"pages": pages, "comment_counts": comment_counts}
+    with open(os.path.join(corpus_dir, CORPUS_INDEX), "w") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    return len(pages), len(comment_counts)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Serve a recorded corpus, pretending to be Real Python and disqus.
+
+    Every response is delayed by `latency` +/- `jitter` seconds, and a fraction
+    `throttle` of requests is answered with 429 (with a `Retry-After` of
+    `retry_after` seconds). Pages have an ETag, so revalidation works.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, corpus_dir, port=0, latency=0.0, jitter=0.0, throttle=0.0, retry_after=0
+    ):
+        super().__init__(("127.0.0.1", port), ReplayHandler)
+        with open(os.path.join(corpus_dir, CORPUS_INDEX)) as f:
+            index = json.load(f)
+        self.corpus_dir = corpus_dir
+        self.pages = index["pages"]
+        self.comment_counts = index["comment_counts"]
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle = throttle
+        self.retry_after = retry_after
+
+        self.random = random.Random(0)
+        self.stats_lock = threading.Lock()
+        self.stats = dict.fromkeys(["requests", "200", "304", "404", "429"], 0)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def count(self, status):
+        with self.stats_lock:
+            self.stats["requests"] += 1
+            self.stats[status] += 1
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.stats_lock:
+            delay = server.latency + server.random.uniform(-1, 1) * server.jitter
+            throttled = server.random.random() < server.throttle
+        # The topic list is fetched without retrying (see fetch_available_topics)
+        throttled = throttled and self.path != "/"
+        time.sleep(max(delay, 0.0))
+
+        if throttled:
+            server.count("429")
+            self.send_response(429)
+            self.send_header("Retry-After", str(server.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        path = self.path
+        if urlsplit(path).path.endswith("/count-data.js"):
+            body, content_type = self.disqus_response(path), "application/javascript"
+        elif path in server.pages:
+            page = server.pages[path]
+            with open(os.path.join(server.corpus_dir, page["file"]), "rb") as f:
+                body = f.read()
+            content_type = page["content_type"]
+        else:
+            server.count("404")
+            self.send_error(404)
+            return
+
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            server.count("304")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        server.count("200")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def disqus_response(self, path) -> bytes:
+        # Any combination of identifiers can be queried, so responses are built
+        # from the recorded counts rather than replayed
+        identifiers = parse_qs(urlsplit(path).query).get("1", [])
+        counts = [
+            {"id": i, "comments": self.server.comment_counts.get(i, 0)}
+            for i in identifiers
+        ]
+        data = json.dumps({"text": {}, "counts": counts}, separators=(",", ":"))
+        return f"var DISQUSWIDGETS;DISQUSWIDGETS.displayCount({data});".encode()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def crawl(args):
+    """Run one crawl against `args.base_url` and return its measurements."""
+    import disqus
+    import fetch
+    import summarizer
+
+    from metrics import percentile
+
+    summarizer.Summarizer._BASE_URL = args.base_url
+    disqus.DISQUS_URL = args.base_url + "/count-data.js"
+
+    latencies = []
+    timings = {"parse": 0.0, "convert": 0.0}
+    lock = threading.Lock()
+
+    def timed(name, function):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with lock:
+                    timings[name] += elapsed
+
+        return wrapper
+
+    # Module-level helpers are looked up at call time, so wrapping them times
+    # every call made in this process (but not in a process pool)
+    summarizer.get_tree = timed("parse", summarizer.get_tree)
+    summarizer.convert_introduction = timed("convert", summarizer.convert_introduction)
+
+    get_response = summarizer.Summarizer.get_response
+
+    def timed_get_response(self, url, **kwargs):
+        start = time.perf_counter()
+        response = get_response(self, url, **kwargs)
+        if summarizer.cache_status(response) != "fresh":  # Not served from cache
+            with lock:
+                latencies.append(time.perf_counter() - start)
+        return response
+
+    summarizer.Summarizer.get_response = timed_get_response
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        s = summarizer.Summarizer(
+            selected_topics=args.selected_topics,
+            output_dir="generated_markdown",
+            workers=args.workers,
+            requests_per_second=args.rate,
+            eager=True,
+            store_path="tutorial_store.sqlite",
+            incremental=args.scenario == "incremental",
+            processes=args.processes,
+        )
+        for topic in s.topics:
+            filename = f"{topic.name} tutorials and courses.md"
+            path = os.path.join(s.output_dir, filename)
+            fetch.write_topic(topic, path, queue_depth=64)
+        tutorials = s.registry.created
+    elapsed = time.perf_counter() - start
+    transport = s.transport.stats().values()
+
+    # ru_maxrss is in KiB on Linux (but in bytes on macOS)
+    scale = 1 if sys.platform == "darwin" else 1024
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    return {
+        "scenario": args.scenario,
+        "seconds": elapsed,
+        "tutorials": tutorials,
+        "pages": len(latencies),
+        "pages_per_second": len(latencies) / elapsed,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p99": percentile(latencies, 99),
+        "parse_seconds": timings["parse"],
+        "convert_seconds": timings["convert"],
+        "peak_rss": peak_rss,
+        "connections": sum(stats.connections for stats in transport),
+        "reused_connections": sum(stats.reused for stats in transport),
+        "bytes_on_wire": sum(stats.bytes_on_wire for stats in transport),
+    }
+
+
+def run_benchmarks(args):
+    """Replay the corpus and run each scenario in a child process."""
+    server = ReplayServer(
+        args.corpus_dir,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        throttle=args.throttle,
+        retry_after=args.retry_after,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    workdir = tempfile.mkdtemp(prefix="summarizer-benchmark-")
+    results = []
+    topics = [] if args.selected_topics == "all" else args.selected_topics
+    try:
+        for name, scenario in RUNS:
+            server.reset_stats()
+            command = [
+                sys.executable,
+                os.path.abspath(__file__),
+                "crawl",
+                server.base_url,
+                scenario,
+                *topics,
+                f"--workers={args.workers}",
+                f"--processes={args.processes}",
+                f"--rate={args.rate}",
+            ]
+            output = subprocess.run(
+                command, cwd=workdir, check=True, stdout=subprocess.PIPE
+            ).stdout
+            result = json.loads(output.decode().splitlines()[-1])
+            result["name"] = name
+            result["server"] = dict(server.stats)
+            results.append(result)
+            print_result(result)
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json_path is not None:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+def print_result(result):
+    def ms(seconds):
+        return "-" if seconds is None else f"{seconds * 1000:.1f} ms"
+
+    server = result["server"]
+    print(f"{result['name']}:")
+    print(f"    time:        {result['seconds']:.2f} s")
+    print(f"    tutorials:   {result['tutorials']}")
+    print(
+        f"    pages:       {result['pages']} "
+        f"({result['pages_per_second']:.1f} pages/s)"
+    )
+    print(
+        f"    latency:     p50 {ms(result['latency_p50'])}, "
+        f"p99 {ms(result['latency_p99'])}"
+    )
+    print(f"    parse time:  {result['parse_seconds']:.2f} s")
+    print(f"    convert:     {result['convert_seconds']:.2f} s")
+    print(f"    peak RSS:    {result['peak_rss'] / 2 ** 20:.1f} MiB")
+    print(
+        f"    connections: {result['connections']} opened, "
+        f"{result['reused_connections']} reuses, "
+        f"{result['bytes_on_wire'] / 2 ** 20:.2f} MiB received"
+    )
+    print(
+        f"    server:      {server['requests']} requests "
+        f"({server['200']} ok, {server['304']} not modified, "
+        f"{server['429']} throttled, {server['404']} not found)"
+    )
+
+
+parser = argparse.ArgumentParser(
+    description=(
+        "Record a fixture corpus from Real Python, or benchmark the Summarizer "
+        "against a local server replaying it."
+    )
+)
+subparsers = parser.add_subparsers(dest="command")
+subparsers.required = True
+
+record_parser = subparsers.add_parser("record", help="Record a fixture corpus")
+run_parser = subparsers.add_parser("run", help="Benchmark against the corpus")
+crawl_parser = subparsers.add_parser(
+    "crawl", help="Run a single crawl (used internally by `run`)"
+)
+
+crawl_parser.add_argument("base_url", help="Url of the replay server")
+crawl_parser.add_argument("scenario", choices=SCENARIOS)
+
+for subparser in (record_parser, run_parser, crawl_parser):
+    subparser.add_argument(
+        "selected_topics",
+        metavar="topic",
+        nargs="*",
+        default="all",
+        help="Only crawl the given topic(s) (default: 'all')",
+    )
+
+for subparser in (record_parser, run_parser):
+    subparser.add_argument(
+        "-c",
+        "--corpus",
+        dest="corpus_dir",
+        default="benchmark_corpus",
+        help="Directory of the fixture corpus (default: 'benchmark_corpus')",
+    )
+
+for subparser in (run_parser, crawl_parser):
+    subparser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        type=int,
+        default=1,
+        help="Number of threads used to fetch pages (default: 1)",
+    )
+    subparser.add_argument(
+        "--processes",
+        dest="processes",
+        type=int,
+        default=0,
+        help=(
+            "Number of processes used to parse pages; raises --workers to at "
+            "least this number (default: 0)"
+        ),
+    )
+    subparser.add_argument(
+        "-r",
+        "--rate",
+        dest="rate",
+        type=float,
+        default=1000.0,
+        help="Maximum number of requests per second (default: 1000)",
+    )
+
+run_parser.add_argument(
+    "--latency",
+    dest="latency",
+    type=float,
+    default=0.0,
+    help="Mean response latency of the server, in milliseconds (default: 0)",
+)
+run_parser.add_argument(
+    "--jitter",
+    dest="jitter",
+    type=float,
+    default=0.0,
+    help="Maximum deviation from the mean latency, in milliseconds (default: 0)",
+)
+run_parser.add_argument(
+    "--throttle",
+    dest="throttle",
+    type=float,
+    default=0.0,
+    help="Fraction of requests answered with 429 (default: 0)",
+)
+run_parser.add_argument(
+    "--retry-after",
+    dest="retry_after",
+    type=int,
+    default=0,
+    help="Retry-After of throttled responses, in seconds (default: 0)",
+)
+run_parser.add_argument(
+    "--json",
+    dest="json_path",
+    default=None,
+    help="Also write the results to this JSON file",
+)
+
+
+if __name__ == "__main__":
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        pages, counts = record_corpus(args.selected_topics, args.corpus_dir)
+        print(f"Recorded {pages} pages and {counts} comment counts")
+    elif args.command == "run":
+        run_benchmarks(args)
+    else:
+        print(json.dumps(crawl(args)))
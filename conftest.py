@@ -0,0 +1,175 @@
+"""Fixtures shared by the tests: a small corpus of fake Real Python pages,
+served by a `benchmark.ReplayServer`, and Summarizers that crawl it."""
+
+import hashlib
+import json
+import threading
+
+import pytest
+
+# Local imports
+import benchmark
+import disqus
+import summarizer
+
+
+def tag_link(topic: str) -> str:
+    return f'<a href="/tutorials/{topic}/" class="badge badge-light text-muted">{topic}</a>'
+
+
+def tutorial_path(slug: str, premium=()) -> str:
+    return f"/courses/{slug}/" if slug in premium else f"/{slug}/"
+
+
+def listing_page(topic, slugs, tags, nav_pages, premium=()) -> str:
+    cards = "".join(
+        f'<div class="card border-0"><a href="{tutorial_path(slug, premium)}">'
+        f'<h2 class="card-title">About {slug}</h2></a>'
+        + ('<a href="/account/join/">Join</a>' if slug in premium else "")
+        + f'<p><span>Aug 1, 2019</span></p>{"".join(map(tag_link, tags[slug]))}</div>'
+        for slug in slugs
+    )
+    nav = ""
+    if nav_pages > 1:
+        nav = "".join(
+            f'<li><a class="page-link" href="/tutorials/{topic}/page/{page}/">'
+            f"{page}</a></li>"
+            for page in range(1, nav_pages + 1)
+        )
+        nav = f'<nav aria-label="Page Navigation"><ul>{nav}</ul></nav>'
+    return f'<html><body><div class="row">{cards}</div>{nav}</body></html>'
+
+
+def article_page(slug, tags, introduction=None) -> str:
+    introduction = introduction or f"Introduction to <em>{slug}</em>."
+    return (
+        f"<html><head><title>About {slug} – Real Python</title></head><body>"
+        f'<div class="article"><h1>About {slug}</h1><p><span class="text-muted">'
+        f'by <a class="text-muted" href="#author">Author of {slug}</a>'
+        f'<span class="ml-2 fa fa-clock-o"></span>Aug 1, 2019'
+        f'<span class="ml-2 mr-1 fa fa-comments"></span>'
+        f'<a class="text-muted" href="#reader-comments">'
+        f'<span class="disqus-comment-count" '
+        f'data-disqus-identifier="https://realpython.com/{slug}/">Comments</span></a>'
+        f'<span class="ml-2 fa fa-tags"></span>{"".join(map(tag_link, tags))}'
+        f"</span></p>"
+        f'<div class="article-body"><p>{introduction}</p>'
+        f'<div class="toc">Contents</div><p>Rest</p></div></div></body></html>'
+    )
+
+
+def premium_page(slug) -> str:
+    return (
+        f"<html><head><title>About {slug} – Real Python Membership</title></head>"
+        f'<body><div class="article"><p><span class="text-muted">'
+        f'<span class="fa fa-tags"></span></span></p><div class="article-body">'
+        f'<div class="mb-4"><p>Course about {slug}.</p></div></div></div>'
+        f"</body></html>"
+    )
+
+
+def write_corpus(
+    corpus_dir, topics, cards_per_page=2, nav_pages=None, premium=(), introductions=None
+):
+    """Write a corpus (see `benchmark.ReplayServer`) to `corpus_dir`.
+
+    `topics` maps the name of each topic to the slugs of its tutorials, newest
+    first, and each tutorial is tagged with the topics it is listed under.
+    Listing navs only link to their first `nav_pages` pages (by default, to
+    every page). `introductions` maps slugs to the html of their introduction.
+    """
+    tags = {}
+    for topic, slugs in topics.items():
+        for slug in slugs:
+            tags.setdefault(slug, []).append(topic)
+
+    pages = {
+        "/": '<html><body><div class="sidebar-module sidebar-module-inset border">'
+        f'{"".join(map(tag_link, topics))}</div></body></html>'
+    }
+    for topic, slugs in topics.items():
+        n_pages = max(1, -(-len(slugs) // cards_per_page))
+        for page in range(1, n_pages + 1):
+            path = f"/tutorials/{topic}/" + (f"page/{page}/" if page > 1 else "")
+            start = (page - 1) * cards_per_page
+            pages[path] = listing_page(
+                topic,
+                slugs[start : start + cards_per_page],
+                tags,
+                n_pages if nav_pages is None else nav_pages,
+                premium,
+            )
+    for slug, slug_tags in tags.items():
+        if slug in premium:
+            pages[tutorial_path(slug, premium)] = premium_page(slug)
+        else:
+            introduction = (introductions or {}).get(slug)
+            pages[tutorial_path(slug)] = article_page(slug, slug_tags, introduction)
+
+    index = {"pages": {}, "comment_counts": {}}
+    for path, html in pages.items():
+        body = html.encode()
+        filename = hashlib.sha1(body).hexdigest() + ".html"
+        (corpus_dir / filename).write_bytes(body)
+        index["pages"][path] = {"content_type": "text/html", "file": filename}
+    for count, slug in enumerate(tags):
+        index["comment_counts"][f"https://realpython.com/{slug}/"] = count
+    (corpus_dir / benchmark.CORPUS_INDEX).write_text(json.dumps(index))
+
+
+@pytest.fixture
+def corpus_dir(tmp_path):
+    path = tmp_path / "corpus"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def replay_server(corpus_dir):
+    """Return a function that writes a corpus (see `write_corpus`) and serves
+    it; calling it again replaces the corpus served by the same server."""
+    servers = []
+
+    def serve(topics, **options):
+        write_corpus(corpus_dir, topics, **options)
+        if not servers:
+            server = benchmark.ReplayServer(str(corpus_dir))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            servers.append(server)
+        server = servers[0]
+        index = json.loads((corpus_dir / benchmark.CORPUS_INDEX).read_text())
+        server.pages = index["pages"]
+        server.comment_counts = index["comment_counts"]
+        server.reset_stats()
+        return server
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def make_summarizer(tmp_path, monkeypatch):
+    """Return a function that creates a Summarizer of the pages of a replay
+    server, with its caches (and files) in a temporary directory."""
+    import requests_cache
+
+    work_dir = tmp_path / "run"
+    work_dir.mkdir()
+    monkeypatch.chdir(work_dir)
+    # Each test has its own requests cache and parsed page cache, since the
+    # urls of its server may have been used by a previous test
+    monkeypatch.setattr(summarizer, "_requests_cache_installed", False)
+    summarizer.soup_cache.clear()
+
+    def make(server, **kwargs):
+        monkeypatch.setattr(summarizer.Summarizer, "_BASE_URL", server.base_url)
+        monkeypatch.setattr(summarizer.Summarizer, "_available_topics", None)
+        monkeypatch.setattr(disqus, "DISQUS_URL", server.base_url + "/count-data.js")
+        return summarizer.Summarizer(verbose=False, **kwargs)
+
+    yield make
+    requests_cache.uninstall_cache()
+    summarizer._requests_cache_installed = False
+    summarizer.soup_cache.clear()
@@ -0,0 +1,111 @@
+import json
+import re
+import threading
+
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+# Local imports
+from exceptions import CommentCountError
+from metrics import Metrics
+
+
+# Real Python uses a disqus query to count comments on a given article
+DISQUS_URL = "https://realpython.disqus.com/count-data.js"
+
+# Maximum number of identifiers sent in a single query (keeps URLs short)
+MAX_BATCH_SIZE = 25
+
+
+def generate_count_query_url(*identifiers: str) -> str:
+    """Return the url of a query for the comment counts of all `identifiers`."""
+    assert identifiers
+    query = "&".join("1=" + quote(identifier, safe="") for identifier in identifiers)
+    return DISQUS_URL + "?" + query
+
+
+# The query response is a javascript call of the form
+#     DISQUSWIDGETS.displayCount({..., "counts": [{"id": ..., "comments": ...}]});
+count_query_response_re = re.compile(r"displayCount\((.*)\)", re.DOTALL)
+
+
+def extract_comment_counts(disqus_response) -> Dict[str, int]:
+    """Map each identifier in a count query response to its comment count."""
+    match = count_query_response_re.search(disqus_response.text)
+    try:
+        data = json.loads(match.group(1))
+        return {entry["id"]: int(entry["comments"]) for entry in data["counts"]}
+    except (AttributeError, KeyError, TypeError, ValueError):
+        msg = (
+            f"Failed to parse comment count query response;\n\n"
+            f"regexp == {count_query_response_re!r}\n\n"
+            f"disqus_response.text == {disqus_response.text!r}"
+        )
+        raise CommentCountError(msg)
+
+
+class CommentCounts:
+    """Comment counts for a whole run, fetched from disqus in batches.
+
+    Identifiers are queued with `request` and resolved together on the next
+    `flush` (at most `batch_size` per query). `get` returns a known count
+    immediately; an identifier that was never requested is fetched on its own.
+    Queries are timed with `metrics`, if given.
+    """
+
+    def __init__(
+        self,
+        get_response: Callable,
+        batch_size: int = MAX_BATCH_SIZE,
+        metrics: Optional[Metrics] = None,
+    ):
+        assert batch_size >= 1
+        self.get_response = get_response
+        self.batch_size = batch_size
+        self.metrics = metrics
+        self.queries = 0
+
+        self._lock = threading.RLock()
+        self._counts: Dict[str, int] = {}
+        self._pending: List[str] = []
+
+    def request(self, identifier: str):
+        with self._lock:
+            if identifier not in self._counts and identifier not in self._pending:
+                self._pending.append(identifier)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            for start in range(0, len(pending), self.batch_size):
+                self._query(pending[start : start + self.batch_size])
+
+    def get(self, identifier: str) -> int:
+        with self._lock:
+            if identifier not in self._counts:
+                self.request(identifier)
+                self.flush()
+            return self._counts[identifier]
+
+    def _query(self, identifiers: Iterable[str]):
+        url = generate_count_query_url(*identifiers)
+        if self.metrics is None:
+            response = self.get_response(url)
+        else:
+            with self.metrics.timer("comment_query"):
+                response = self.get_response(url)
+            self.metrics.count("comment_identifiers", n=len(identifiers))
+        self.queries += 1
+        counts = extract_comment_counts(response)
+        missing = [i for i in identifiers if i not in counts]
+        if missing:
+            msg = (
+                f"Comment count query response is missing identifiers;\n\n"
+                f"missing == {missing!r}\n\n"
+                f"disqus_response.text == {response.text!r}"
+            )
+            raise CommentCountError(msg)
+        self._counts.update(counts)
+
+    def __len__(self):
+        return len(self._counts)
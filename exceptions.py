@@ -6,7 +6,7 @@ class Error(Exception):
 
 
 class CommentCountError(Error):
-    """utils.extract_comment_count
+    """disqus.extract_comment_counts
     The data returned by disqus could not be parsed."""
 
 
@@ -36,3 +36,8 @@ class GetResponseError(Error):
 class UnsuccessfulGet(GetResponseError):
     """Summarizer.get_response
     Received an unexpected response code."""
+
+
+class DeadlineExceeded(UnsuccessfulGet):
+    """Summarizer.get_response
+    No response was received before the request's deadline."""
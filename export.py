@@ -0,0 +1,112 @@
+import abc
+import csv
+import json
+import os
+import tempfile
+import threading
+
+from typing import Optional
+
+# Local imports
+from summarizer import ARTICLE_FIELDS
+
+# Temporary files are only readable by their owner; once complete, files get
+# the permissions that `open` would have given them
+UMASK = os.umask(0o022)
+os.umask(UMASK)
+
+
+# Columns of exported rows; fields that were not requested are left empty
+EXPORT_COLUMNS = (
+    "topic",
+    "title",
+    "url",
+    "is_premium",
+    "date",
+    "tags",
+    "author",
+    "author_url",
+    "comment_count",
+    "comments_url",
+    "introduction",
+)
+
+
+def tutorial_row(tutorial, topic: Optional[str] = None, fields=ARTICLE_FIELDS) -> dict:
+    """Return the exported values of a Tutorial (or TutorialRecord).
+
+    Only the given article `fields` are included, so exporting does not fetch
+    anything that the markdown output does not (see `render_tutorial`).
+    """
+    row = dict.fromkeys(EXPORT_COLUMNS)
+    row.update(
+        topic=topic,
+        title=tutorial.title,
+        url=tutorial.url,
+        is_premium=tutorial.is_premium,
+        date=tutorial.date.date().isoformat() if tutorial.has_date else None,
+        tags=list(tutorial.tag_names),
+    )
+    if "author" in fields and tutorial.has_author:
+        row.update(author=tutorial.author.name, author_url=tutorial.author.url)
+    if "comments" in fields and tutorial.has_comments:
+        comments = tutorial.comments
+        row.update(comment_count=comments.count, comments_url=comments.url)
+    if "introduction" in fields:
+        row.update(introduction=tutorial.markdown_introduction)
+    return row
+
+
+class RowWriter(abc.ABC):
+    """Streams rows to a file as they are written, from any number of threads.
+
+    Rows are written to a temporary file, which is only renamed to `path` by
+    `close` once every row has been written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+
+        self._lock = threading.Lock()
+        fd, self._temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path) or ".", suffix=".tmp"
+        )
+        os.chmod(self._temp_path, 0o666 & ~UMASK)
+        self._file = os.fdopen(fd, "w", encoding="utf-8", newline="")
+        self._start()
+
+    def write(self, row: dict):
+        with self._lock:
+            self._write(row)
+            self.rows += 1
+
+    def close(self, complete: bool = True):
+        with self._lock:
+            self._file.close()
+            if complete:
+                os.replace(self._temp_path, self.path)
+            else:
+                os.remove(self._temp_path)
+
+    def _start(self):
+        pass
+
+    @abc.abstractmethod
+    def _write(self, row: dict):
+        pass
+
+
+class JsonLinesWriter(RowWriter):
+    def _write(self, row: dict):
+        self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+class CsvWriter(RowWriter):
+    def _start(self):
+        self._writer = csv.DictWriter(self._file, fieldnames=EXPORT_COLUMNS)
+        self._writer.writeheader()
+
+    def _write(self, row: dict):
+        # Tag names do not contain semicolons
+        self._writer.writerow(dict(row, tags=";".join(row["tags"])))
@@ -1,9 +1,19 @@
 import argparse
+import hashlib
+import json
 import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from operator import attrgetter
 
 # Local imports
-from summarizer import Summarizer
+from export import UMASK, CsvWriter, JsonLinesWriter, tutorial_row
+from journal import CrawlJournal
+from records import format_metadata_string
+from summarizer import ARTICLE_FIELDS, Summarizer, TutorialLoader, soup_cache
 
 parser = argparse.ArgumentParser(
     description=(
@@ -44,34 +54,803 @@ parser.add_argument(
     ),
 )
 
+parser.add_argument(
+    "-w",
+    "--workers",
+    dest="workers",
+    type=int,
+    default=1,
+    help=(
+        "Number of article pages to fetch concurrently. Output order does not "
+        "depend on this value. (default: 1)"
+    ),
+)
+
+parser.add_argument(
+    "--processes",
+    dest="processes",
+    type=int,
+    default=0,
+    help=(
+        "Number of processes used to parse pages and convert introductions to "
+        "markdown. Raises --workers to at least this number, since each "
+        "process is fed by a worker. (default: 0, i.e. parse in the main "
+        "process)"
+    ),
+)
+
+parser.add_argument(
+    "-r",
+    "--rate",
+    dest="requests_per_second",
+    type=float,
+    default=5.0,
+    help=(
+        "Maximum number of uncached requests per second, shared by all workers. "
+        "The rate is lowered automatically if the server asks us to slow down. "
+        "(default: 5)"
+    ),
+)
+
+parser.add_argument(
+    "--timeout",
+    dest="timeout",
+    type=float,
+    default=None,
+    help=(
+        "Seconds to wait for a connection or for data from the server before "
+        "a request fails. (default: 5 to connect, 30 to read)"
+    ),
+)
+
+parser.add_argument(
+    "--retries",
+    dest="retries",
+    type=int,
+    default=3,
+    help=(
+        "Number of times a request is retried after a connection error, a "
+        "timeout, a 5xx response (with exponential backoff) or a 429 response "
+        "(once the server's Retry-After has passed). (default: 3)"
+    ),
+)
+
+parser.add_argument(
+    "--deadline",
+    dest="deadline",
+    type=float,
+    default=120.0,
+    help=(
+        "Seconds after which a request (including its retries) is abandoned "
+        "and the run fails. (default: 120)"
+    ),
+)
+
+parser.add_argument(
+    "--hedge-after",
+    dest="hedge_after",
+    type=float,
+    default=None,
+    help=(
+        "Send a duplicate of any request still unanswered after this many "
+        "seconds, and use the first response. (default: do not hedge)"
+    ),
+)
+
+parser.add_argument(
+    "--soup-cache-mb",
+    dest="soup_cache_mb",
+    type=int,
+    default=256,
+    help=(
+        "Approximate amount of memory (in MiB) used to keep parsed pages for "
+        "reuse by other topics. (default: 256)"
+    ),
+)
+
+parser.add_argument(
+    "--http-cache-mb",
+    dest="http_cache_mb",
+    type=int,
+    default=512,
+    help=(
+        "Maximum size (in MiB) of the compressed cache of fetched pages; least "
+        "recently used pages are evicted beyond it. See `python httpcache.py "
+        "--help` to report on or compact the cache. (default: 512)"
+    ),
+)
+
+parser.add_argument(
+    "--store",
+    dest="store_path",
+    default="tutorial_store.sqlite",
+    help=(
+        "SQLite file in which to keep extracted tutorials, so that unchanged "
+        "articles are not parsed again on later runs. Use an empty string to "
+        "disable. (default: 'tutorial_store.sqlite')"
+    ),
+)
+
+parser.add_argument(
+    "--revalidate",
+    dest="revalidate",
+    action="store_true",
+    help=(
+        "Check every cached page with a conditional request instead of using "
+        "cached pages forever. Unchanged pages are not downloaded again. "
+        "(default: do not revalidate)"
+    ),
+)
+
+parser.add_argument(
+    "--resume",
+    dest="resume",
+    action="store_true",
+    help=(
+        "Resume the previous run if it did not complete (e.g. after an error "
+        "or being interrupted), skipping the topic files and tutorials it "
+        "completed. Progress is recorded in 'crawl_journal.sqlite'. "
+        "(default: start over)"
+    ),
+)
+
+parser.add_argument(
+    "-i",
+    "--incremental",
+    dest="incremental",
+    action="store_true",
+    help=(
+        "Refresh topic listings, but stop paginating at the first page whose "
+        "tutorials are all known from the previous run, then merge new and "
+        "known tutorials. Requires --store. (default: fetch every page)"
+    ),
+)
+
+parser.add_argument(
+    "-t",
+    "--topic-workers",
+    dest="topic_workers",
+    type=int,
+    default=1,
+    help="Number of topics to fetch and write at the same time (default: 1)",
+)
+
+parser.add_argument(
+    "--queue-depth",
+    dest="queue_depth",
+    type=int,
+    default=64,
+    help=(
+        "Maximum number of rendered tutorials waiting to be written, per topic "
+        "being written. (default: 64)"
+    ),
+)
+
+parser.add_argument(
+    "-q",
+    "--quiet",
+    dest="verbose",
+    action="store_false",
+    help="Do not print every fetched page",
+)
+
+parser.add_argument(
+    "--metrics",
+    dest="metrics_path",
+    default=None,
+    help=(
+        "File in which to dump counters and timings of each stage of the run, "
+        "per topic, as JSON, e.g. 'run_metrics.json'. (default: not written)"
+    ),
+)
+
+parser.add_argument(
+    "--tag",
+    dest="tags",
+    action="append",
+    default=[],
+    help=(
+        "Only write tutorials tagged with this tag; may be repeated, in which "
+        "case tutorials must have every tag. Matching tutorials are written to "
+        "a single file. If no topic is given, only the topics of these tags "
+        "are fetched."
+    ),
+)
+
+parser.add_argument(
+    "--since",
+    dest="since",
+    type=datetime.fromisoformat,
+    default=None,
+    help="Only write tutorials published on or after this date (YYYY-MM-DD)",
+)
+
+parser.add_argument(
+    "--until",
+    dest="until",
+    type=datetime.fromisoformat,
+    default=None,
+    help="Only write tutorials published on or before this date (YYYY-MM-DD)",
+)
+
+parser.add_argument(
+    "--author",
+    dest="author",
+    default=None,
+    help=(
+        "Only write tutorials by this author. Authors are not listed on topic "
+        "pages, so every other matching tutorial is fetched to find them."
+    ),
+)
+
+
+def parse_fields(value: str) -> tuple:
+    if value == "cards":
+        return ()
+    fields = tuple(field.strip() for field in value.split(","))
+    for field in fields:
+        if field not in ARTICLE_FIELDS:
+            raise argparse.ArgumentTypeError(f"unknown field {field!r}")
+    return fields
+
+
+parser.add_argument(
+    "--fields",
+    dest="fields",
+    type=parse_fields,
+    default=ARTICLE_FIELDS,
+    help=(
+        "Comma-separated fields to write, besides the title, date and tags "
+        f"listed on topic pages: any of {', '.join(ARTICLE_FIELDS)}. Use "
+        "'cards' for none of them, in which case no article page is fetched. "
+        "Comment counts require a disqus query. (default: all of them)"
+    ),
+)
+
+parser.add_argument(
+    "--jsonl",
+    dest="jsonl_path",
+    default=None,
+    help="Also export the written tutorials to this JSON Lines file",
+)
+
+parser.add_argument(
+    "--csv",
+    dest="csv_path",
+    default=None,
+    help="Also export the written tutorials to this CSV file",
+)
+
+parser.add_argument(
+    "--force",
+    dest="force",
+    action="store_true",
+    help=(
+        "Rewrite every file, even if its tutorials have not changed since it "
+        "was written. (default: only rewrite changed files)"
+    ),
+)
+
+parser.add_argument(
+    "--list-topics",
+    dest="list_topics",
+    action="store_true",
+    help=(
+        "Print the available topics and exit. The list of topics is cached "
+        "for a day (in 'available_topics.json')."
+    ),
+)
+
+
+def render_tutorial(tutorial, fields=ARTICLE_FIELDS) -> str:
+    # Title of the tutorial
+    chunks = [tutorial.markdown_title + "\n\n"]
+
+    if set(fields) == set(ARTICLE_FIELDS):
+        # Include author, date, tags, and comment count (if available)
+        if tutorial.has_metadata_string:
+            chunks.append(tutorial.markdown_metadata_string + "\n\n")
+    else:
+        # Only include the requested fields (tags are always available)
+        author = tutorial.author if "author" in fields and tutorial.has_author else None
+        comments = None
+        if "comments" in fields and tutorial.has_comments:
+            comments = tutorial.comments
+        metadata_string = format_metadata_string(
+            author,
+            tutorial.date if tutorial.has_date else None,
+            tutorial.tags,
+            comments.count if comments is not None else None,
+            comments.url if comments is not None else None,
+        )
+        chunks.append(metadata_string + "\n\n")
+
+    # First few paragraphs of the article
+    if "introduction" in fields:
+        chunks.append(tutorial.markdown_introduction + "\n\n")
+    return "".join(chunks)
+
+
+# Increment whenever the markdown written for the same tutorials changes
+OUTPUT_VERSION = 1
+
+
+class MarkdownDigest:
+    """Digest of the values `write_markdown` writes to a file, updated with
+    each tutorial as it is written.
+
+    The digest is computed from the values that `render_tutorial` uses (not
+    from the rendered markdown), so it only changes when they do.
+    """
+
+    def __init__(self, heading, fields=ARTICLE_FIELDS):
+        self.fields = fields
+        self._sha1 = hashlib.sha1(
+            json.dumps([OUTPUT_VERSION, heading, sorted(fields)]).encode("utf-8")
+        )
+
+    def update(self, tutorial, row=None):
+        # `row` is the exported row of `tutorial` (see `tutorial_row`), if known
+        if row is None:
+            row = tutorial_row(tutorial, fields=self.fields)
+        # Digests do not depend on the topic, but do on the urls of tags
+        row = dict(row, topic=None, tags=[list(tag) for tag in tutorial.tags])
+        self._sha1.update(json.dumps(row, sort_keys=True).encode("utf-8"))
+
+    def hexdigest(self) -> str:
+        return self._sha1.hexdigest()
+
+
+def markdown_digest(heading, tutorials, fields=ARTICLE_FIELDS) -> str:
+    """Return the `MarkdownDigest` of a file with `heading` and `tutorials`."""
+    digest = MarkdownDigest(heading, fields)
+    for tutorial in tutorials:
+        digest.update(tutorial)
+    return digest.hexdigest()
+
+
+class OutputManifest:
+    """Digests (see `MarkdownDigest`) of the files written by previous runs.
+
+    Files that are already up to date are not written again (see
+    `write_markdown`), unless `force` is set. The paths of changed and
+    unchanged files are kept for a summary.
+    """
+
+    def __init__(self, path: str = "output_manifest.json", force: bool = False):
+        self.path = path
+        self.force = force
+        self.changed = []
+        self.unchanged = []
+
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self._digests = json.load(f)
+        except (OSError, ValueError):
+            self._digests = {}
+        self._dirty = False
+
+    def may_be_current(self, path: str) -> bool:
+        """Whether `path` should be compared with its new content before it is
+        written, rather than written regardless."""
+        return not self.force and os.path.exists(path)
+
+    def update(self, path: str, digest: str, changed: bool = True):
+        with self._lock:
+            (self.changed if changed else self.unchanged).append(path)
+            if self._digests.get(path) != digest:
+                self._digests[path] = digest
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self._digests, f, indent=1, sort_keys=True)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+
+    def print_summary(self):
+        print(f"\nChanged files: {len(self.changed)}")
+        for path in sorted(self.changed):
+            print(f"    {path}")
+        print(f"Unchanged files: {len(self.unchanged)}")
+
+
+def topic_filename(name: str) -> str:
+    return f"{name} tutorials and courses.md"
+
+
+def topic_heading(name: str) -> str:
+    return f"# {name} tutorials and courses from Real Python"
+
+
+def write_topic(
+    topic,
+    path,
+    queue_depth,
+    metrics=None,
+    exporters=(),
+    journal=None,
+    manifest=None,
+):
+    """Write the markdown file for `topic` to `path` (see `write_markdown`).
+
+    Once the file is complete (or unchanged), it is recorded in `journal`, if
+    given.
+    """
+    heading = topic_heading(topic.name)
+    write_markdown(
+        path,
+        heading,
+        topic.tutorials,
+        queue_depth,
+        metrics,
+        name=topic.name,
+        fields=topic.summarizer.fields,
+        exporters=exporters,
+        manifest=manifest,
+    )
+    if journal is not None:
+        journal.put_topic(topic.name, path)
+
+
+def write_markdown(
+    path,
+    heading,
+    tutorials,
+    queue_depth,
+    metrics=None,
+    name=None,
+    fields=ARTICLE_FIELDS,
+    exporters=(),
+    manifest=None,
+):
+    """Write a markdown file with `heading`, followed by each of `tutorials`.
+
+    Only the given `fields` of each tutorial are written (see `render_tutorial`),
+    and each tutorial is also written to every one of `exporters` as it goes.
+
+    Tutorials are rendered by the calling thread and written to disk by a
+    writer thread, with at most `queue_depth` rendered tutorials in between.
+    The file is written under a temporary name and only renamed to `path`
+    once complete, so `path` never contains a partially written file.
+    Writes are timed with `metrics`, if given, and counted against the topic
+    `name`.
+
+    With a `manifest`, the rendered markdown is first compared with the
+    existing file at `path` as it goes, and the temporary file is only created
+    (starting with the part of `path` that matched) once they differ. An
+    unchanged file is therefore not written at all, and keeps its
+    modification time; returns whether `path` was replaced.
+    """
+    print(f"\nWriting file `{path}`\n")
+    digest = MarkdownDigest(heading, fields) if manifest is not None else None
+    compare = manifest is not None and manifest.may_be_current(path)
+
+    chunks = queue.Queue(maxsize=queue_depth)
+    temp_paths = []  # The temporary file, once created by the writer
+    write_errors = []
+
+    def write(f, chunk):
+        if metrics is None:
+            f.write(chunk)
+            return
+        with metrics.timer("write", name):
+            f.write(chunk)
+        metrics.count("characters_written", name, len(chunk))
+
+    def open_temp_file(old, matched):
+        # Starts with the `matched` characters that `old` has in common
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path) or ".", suffix=".md.tmp"
+        )
+        temp_paths.append(temp_path)
+        os.chmod(temp_path, 0o666 & ~UMASK)
+        f = os.fdopen(fd, "w", encoding="utf-8")
+        try:
+            if matched:
+                old.seek(0)
+                write(f, old.read(matched))
+        except BaseException:
+            f.close()
+            raise
+        return f
+
+    def writer():
+        old = new = None
+        matched = 0  # Characters of `old` that are the same as the output
+        try:
+            if compare:
+                try:
+                    # Undecodable characters are replaced, so they never match
+                    old = open(path, encoding="utf-8", errors="replace")
+                except FileNotFoundError:
+                    pass
+            if old is None:
+                new = open_temp_file(old, matched)
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                if write_errors:
+                    continue  # Keep draining the queue after an error
+                try:
+                    if new is None:
+                        if old.read(len(chunk)) == chunk:
+                            matched += len(chunk)
+                            continue
+                        new = open_temp_file(old, matched)
+                    write(new, chunk)
+                except Exception as e:
+                    write_errors.append(e)
+            if new is None and not write_errors and old.read(1):
+                # The output is a truncated copy of `path`
+                new = open_temp_file(old, matched)
+        except Exception as e:  # E.g. when flushing the file
+            write_errors.append(e)
+        finally:
+            for f in (old, new):
+                if f is not None:
+                    try:
+                        f.close()
+                    except Exception as e:
+                        write_errors.append(e)
+
+    writer_thread = threading.Thread(target=writer, name=f"writer-{name or path}")
+    writer_thread.start()
+
+    complete = False
+    try:
+        # Main title of the file
+        chunks.put(heading + "\n\n")
+        for tutorial in tutorials:
+            if write_errors:
+                break  # Raised below
+            chunks.put(render_tutorial(tutorial, fields))
+            if exporters or digest is not None:
+                row = tutorial_row(tutorial, name, fields)
+                for exporter in exporters:
+                    exporter.write(row)
+                if digest is not None:
+                    digest.update(tutorial, row)
+        complete = True
+    finally:
+        chunks.put(None)
+        writer_thread.join()
+        replace = complete and not write_errors and bool(temp_paths)
+        for temp_path in temp_paths:
+            if replace:
+                os.replace(temp_path, path)
+            else:
+                os.remove(temp_path)
+    if write_errors:
+        raise write_errors[0]
+    if manifest is not None:
+        manifest.update(path, digest.hexdigest(), changed=replace)
+        if not replace:
+            print(f"\nUnchanged file `{path}`\n")
+    return replace
+
+
+def export_topic(topic, exporters):
+    """Write the tutorials of `topic` to `exporters` only (see `write_markdown`)."""
+    fields = topic.summarizer.fields
+    for tutorial in topic.tutorials:
+        row = tutorial_row(tutorial, topic.name, fields)
+        for exporter in exporters:
+            exporter.write(row)
+
+
+def write_selected(summarizer, path, args, exporters=(), manifest=None):
+    """Write the tutorials that match the filters in `args` to `path`.
+
+    Matches are found in an index built from the topic listings, so only the
+    article pages of matching tutorials are fetched.
+    """
+    index = summarizer.build_index()
+    records = index.query(tags=args.tags, since=args.since, until=args.until)
+    matches = 0
+
+    def count_matches(records):
+        nonlocal matches
+        for record in records:
+            matches += 1
+            yield record
+
+    if args.fields or args.author is not None:
+        # Only the fields that are written (or filtered on) are extracted
+        fields = set(args.fields)
+        if args.author is not None:
+            fields.add("author")
+        records = TutorialLoader(summarizer).load_all(records, fields)
+    if args.author is not None:
+        records = (r for r in records if r.has_author and r.author.name == args.author)
+    records = count_matches(records)
+
+    criteria = []
+    if args.tags:
+        criteria.append("tagged " + " and ".join(args.tags))
+    if args.author is not None:
+        criteria.append(f"by {args.author}")
+    if args.since is not None:
+        criteria.append(f"since {args.since.date()}")
+    if args.until is not None:
+        criteria.append(f"until {args.until.date()}")
+    heading = "# Tutorials and courses from Real Python " + ", ".join(criteria)
+    write_markdown(
+        path,
+        heading,
+        records,
+        args.queue_depth,
+        summarizer.metrics,
+        fields=args.fields,
+        exporters=exporters,
+        manifest=manifest,
+    )
+    # Tutorials are filtered by author as they are written
+    print(f"\nFound {matches} matching tutorials out of {len(index)}")
+
+
 if __name__ == "__main__":
 
     args = parser.parse_args()
 
-    summarizer = Summarizer(
-        selected_topics=args.selected_topics,
+    if args.list_topics:
+        print("\n".join(sorted(Summarizer.fetch_available_topics())))
+        raise SystemExit
+
+    selected = args.tags or args.since or args.until or args.author is not None
+    selected_topics = args.selected_topics
+    if args.tags:
+        # Tags are topics, so tutorials cannot have any other tag
+        available_topics = Summarizer.fetch_available_topics()
+        unknown_tags = [tag for tag in args.tags if tag not in available_topics]
+        if unknown_tags:
+            parser.error(
+                f"unknown tag(s): {', '.join(unknown_tags)} (see --list-topics)"
+            )
+    if args.tags and selected_topics == "all":
+        # Every tutorial with these tags is listed under each of their topics
+        selected_topics = args.tags
+
+    # A run can only be resumed by a run that writes the same output
+    options = dict(
+        selected_topics=selected_topics,
         include_premium=args.include_premium,
         output_dir=args.output_dir,
+        fields=list(args.fields),
+        tags=args.tags,
+        since=str(args.since),
+        until=str(args.until),
+        author=args.author,
     )
+    journal = CrawlJournal(options=options, resume=args.resume)
+    if args.resume and not journal.resumed:
+        print("Nothing to resume: starting over")
+    elif journal.resumed:
+        print(f"Resuming: {journal.resumable_tutorials} tutorials already extracted")
 
-    for topic in summarizer.topics:
-        # Write a separate file for each topic
-        filename = f"{topic.name} tutorials and courses.md"
+    summarizer = Summarizer(
+        selected_topics=selected_topics,
+        include_premium=args.include_premium,
+        output_dir=args.output_dir,
+        workers=args.workers,
+        requests_per_second=args.requests_per_second,
+        soup_cache_size=args.soup_cache_mb * 2**20,
+        eager=True,  # Every tutorial is written, so fetch comment counts in batches
+        store_path=args.store_path or None,
+        revalidate=args.revalidate,
+        incremental=args.incremental,
+        processes=args.processes,
+        verbose=args.verbose,
+        fields=args.fields,
+        http_cache_size=args.http_cache_mb * 2**20,
+        # Listing pages are fetched by topic threads, articles by workers
+        connections=max(args.workers, args.processes) + args.topic_workers,
+        timeout=args.timeout,
+        journal=journal,
+        retries=args.retries,
+        deadline=args.deadline,
+        hedge_after=args.hedge_after,
+    )
 
-        path = os.path.join(summarizer.output_dir, filename)
-        print(f"\nWriting file `{path}`\n")
+    # Exported rows are streamed by the same pass that writes markdown files
+    exporters = []
+    if args.jsonl_path:
+        exporters.append(JsonLinesWriter(args.jsonl_path))
+    if args.csv_path:
+        exporters.append(CsvWriter(args.csv_path))
 
-        with open(path, "w") as f:
-            # Main title of the file
-            f.write(f"# {topic.name} tutorials and courses from Real Python" + "\n\n")
+    # Files whose tutorials have not changed since they were written are
+    # not written again
+    manifest = OutputManifest(force=args.force)
 
-            for tutorial in topic.tutorials:
-                # Title of the tutorial
-                f.write(tutorial.markdown_title + "\n\n")
+    complete = False
+    skipped_topics = 0
+    try:
+        if selected:
+            filename = "selected tutorials and courses.md"
+            path = os.path.join(summarizer.output_dir, filename)
+            write_selected(summarizer, path, args, exporters, manifest)
+        else:
+            # Topics are written concurrently; each has its own writer thread
+            with ThreadPoolExecutor(max_workers=args.topic_workers) as topic_pool:
+                futures = []
+                for topic in summarizer.topics:
+                    # Write a separate file for each topic
+                    filename = topic_filename(topic.name)
+                    path = os.path.join(summarizer.output_dir, filename)
+                    if journal.is_topic_done(topic.name, path):
+                        skipped_topics += 1
+                        print(f"Skipping `{path}` (completed by the resumed run)")
+                        if exporters:
+                            # Its tutorials are reused from the journal
+                            futures.append(
+                                topic_pool.submit(export_topic, topic, exporters)
+                            )
+                        continue
+                    futures.append(
+                        topic_pool.submit(
+                            write_topic,
+                            topic,
+                            path,
+                            args.queue_depth,
+                            summarizer.metrics,
+                            exporters,
+                            journal,
+                            manifest,
+                        )
+                    )
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        complete = True
+    finally:
+        for exporter in exporters:
+            exporter.close(complete)
+        manifest.save()
+    journal.finish()  # Nothing left to resume
+    journal.close()
 
-                # Include author, date, tags, and comment count (if available)
-                if tutorial.has_metadata_string:
-                    f.write(tutorial.markdown_metadata_string + "\n\n")
+    manifest.print_summary()
+    for exporter in exporters:
+        print(f"Exported {exporter.rows} tutorials to `{exporter.path}`")
+    print(f"\nResponses: {dict(summarizer.cache_statuses)}")
+    print(f"Tutorials: {summarizer.registry}")
+    print(f"Parsed page cache: {soup_cache.stats}")
+    for host, stats in summarizer.transport.stats().items():
+        print(f"Connections to {host}: {stats}")
+    latency = summarizer.metrics.percentiles("network")
+    if latency["max"] is not None:
+        print(
+            "Request latency: "
+            + ", ".join(
+                f"{name} {seconds * 1000:.0f} ms" for name, seconds in latency.items()
+            )
+        )
+    counters = summarizer.metrics.as_dict()["total"]["counters"]
+    failures = ("retries", "hedged_requests", "hedges_won", "deadline_exceeded")
+    print(
+        "Retries and hedging: "
+        + ", ".join(f"{name}={counters.get(name, 0)}" for name in failures)
+    )
+    if summarizer.store is not None:
+        store = summarizer.store
+        print(f"Tutorial store: hits={store.hits}, misses={store.misses}")
+    if journal.resumed:
+        print(
+            f"Resumed: skipped {skipped_topics} topic files, reused "
+            f"{journal.reused_tutorials} tutorials"
+        )
 
-                # First few paragraphs of the article
-                f.write(tutorial.markdown_introduction + "\n\n")
+    if args.metrics_path:
+        summarizer.metrics.dump(args.metrics_path)
+        print(f"Run metrics: `{args.metrics_path}`")
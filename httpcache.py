@@ -0,0 +1,315 @@
+"""Compressed, size-bounded storage for the requests cache.
+
+Responses are pickled as usual by requests_cache, then compressed with zlib
+(html compresses about 5:1). Once the stored responses exceed `max_size`
+bytes, the least recently used ones are evicted. Only responses that the
+summarizer uses (html pages and disqus count queries) are cached at all.
+
+The cache can also be maintained from the command line:
+
+    python httpcache.py report
+    python httpcache.py compact --max-mb 256 --max-age-days 90
+    python httpcache.py vacuum
+"""
+
+import argparse
+import threading
+import time
+import zlib
+
+from datetime import timezone
+from typing import Optional
+
+from requests_cache import SQLiteCache
+from requests_cache.cache_keys import create_key
+from requests_cache.serializers import SerializerPipeline, Stage, pickle_serializer
+
+
+DEFAULT_MAX_SIZE = 512 * 2 ** 20  # Bytes of (compressed) responses
+
+# Responses stored before compression was introduced start with a pickle
+# opcode instead of a zlib header, and are loaded as they are
+ZLIB_HEADER = b"x"
+
+
+def compress(data: bytes) -> bytes:
+    return zlib.compress(data, 6)
+
+
+def decompress(data: bytes) -> bytes:
+    return zlib.decompress(data) if data[:1] == ZLIB_HEADER else data
+
+
+compressed_serializer = SerializerPipeline(
+    [*pickle_serializer.stages, Stage(dumps=compress, loads=decompress)],
+    name="compressed_pickle",
+    is_binary=True,
+)
+
+CACHEABLE_CONTENT_TYPES = ("text/html", "javascript")
+
+
+def is_cacheable(response) -> bool:
+    """Only html pages and disqus count queries (javascript) are cached."""
+    content_type = response.headers.get("Content-Type", "")
+    return any(t in content_type for t in CACHEABLE_CONTENT_TYPES)
+
+
+class BoundedSQLiteCache(SQLiteCache):
+    """SQLite cache backend with compressed responses and LRU eviction.
+
+    The last time each response was used is kept in an `access` table of the
+    same database. Uses are recorded in memory and written in batches, so
+    cache hits stay cheap. When a saved response takes the total size of
+    stored responses above `max_size`, least recently used responses are
+    evicted until the total is back under 90% of `max_size`.
+    """
+
+    _TOUCH_BATCH_SIZE = 100
+
+    def __init__(self, db_path="requests_cache", max_size=DEFAULT_MAX_SIZE, **kwargs):
+        super().__init__(db_path, serializer=compressed_serializer, **kwargs)
+        self.max_size = max_size
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._touched = {}  # key -> time of last use, not yet written
+        with self.responses.connection(commit=True) as con:
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS access "
+                "(key TEXT PRIMARY KEY, last_used REAL)"
+            )
+            (self._size,) = con.execute(
+                "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM responses"
+            ).fetchone()
+
+    def create_key(self, request, match_headers=None, **kwargs) -> str:
+        # Keys depend on the serializer; use the uncompressed one, so that
+        # responses cached before compression was introduced are still found
+        settings = self._settings
+        if getattr(settings, "content_root_key", None) is not None:
+            # Only available (and only passed on) with requests-cache >= 1.2
+            kwargs["content_root_key"] = settings.content_root_key
+        return (settings.key_fn or create_key)(
+            request=request,
+            ignored_parameters=settings.ignored_parameters,
+            match_headers=match_headers or settings.match_headers,
+            serializer=pickle_serializer,
+            **kwargs,
+        )
+
+    @property
+    def size(self) -> int:
+        """Total size of the stored responses, in bytes."""
+        return self._size
+
+    def get_response(self, key: str, default=None):
+        response = super().get_response(key, default)
+        if response is not default:
+            with self._lock:
+                self._touched[key] = time.time()
+                flush = len(self._touched) >= self._TOUCH_BATCH_SIZE
+            if flush:
+                self.flush_access_times()
+        return response
+
+    def save_response(self, response, cache_key: Optional[str] = None, expires=None):
+        cache_key = cache_key or self.create_key(response.request)
+        old_size = self._stored_size(cache_key)
+        super().save_response(response, cache_key=cache_key, expires=expires)
+        new_size = self._stored_size(cache_key)
+        with self._lock:
+            self._touched[cache_key] = time.time()
+            self._size += new_size - old_size
+            over_budget = self._size > self.max_size
+        self.flush_access_times()
+        if over_budget:
+            self.evict(int(0.9 * self.max_size))
+
+    def _stored_size(self, key: str) -> int:
+        with self.responses.connection() as con:
+            row = con.execute(
+                "SELECT LENGTH(value) FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row is not None else 0
+
+    def flush_access_times(self):
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if not touched:
+            return
+        with self.responses.connection(commit=True) as con:
+            con.executemany(
+                "INSERT OR REPLACE INTO access (key, last_used) VALUES (?, ?)",
+                touched.items(),
+            )
+
+    def evict(self, target_size: int, unused_since: Optional[float] = None):
+        """Evict least recently used responses until at most `target_size` bytes
+        are stored. Responses not used since the `unused_since` timestamp are
+        evicted regardless of size. Responses never used since they were
+        saved by an older version count as the least recently used.
+        """
+        self.flush_access_times()
+        with self.responses.connection() as con:
+            rows = con.execute(
+                "SELECT r.key, LENGTH(r.value), COALESCE(a.last_used, 0) "
+                "FROM responses AS r LEFT JOIN access AS a ON a.key = r.key "
+                "ORDER BY COALESCE(a.last_used, 0)"
+            ).fetchall()
+
+        with self._lock:
+            size = self._size
+        evicted = []
+        for key, length, last_used in rows:
+            expired = unused_since is not None and last_used < unused_since
+            if size <= target_size and not expired:
+                break
+            evicted.append(key)
+            size -= length
+
+        self._delete(evicted)
+        with self._lock:
+            self._size = size
+            self.evictions += len(evicted)
+        return len(evicted)
+
+    def _delete(self, keys):
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            self.responses.bulk_delete(batch)
+            with self.responses.connection(commit=True) as con:
+                placeholders = ", ".join("?" for _ in batch)
+                con.execute(f"DELETE FROM access WHERE key IN ({placeholders})", batch)
+
+    def compact(self, max_age: Optional[float] = None) -> dict:
+        """Drop uncacheable and (optionally) stale responses, compress old
+        uncompressed ones and shrink the cache to `max_size`.
+
+        Responses saved by older versions have no recorded use; the time they
+        were created is used instead.
+        """
+        self.flush_access_times()
+        stats = dict(uncacheable=0, compressed=0, evicted=0)
+        with self.responses.connection() as con:
+            keys = [key for (key,) in con.execute("SELECT key FROM responses")]
+            known = {key for (key,) in con.execute("SELECT key FROM access")}
+
+        uncacheable = []
+        for key in keys:
+            response = self.responses.get(key)
+            if response is None or not is_cacheable(response):
+                uncacheable.append(key)
+            elif key not in known:
+                created_at = response.created_at.replace(tzinfo=timezone.utc)
+                with self._lock:
+                    self._touched.setdefault(key, created_at.timestamp())
+        self._delete(uncacheable)
+        stats["uncacheable"] = len(uncacheable)
+
+        with self.responses.connection(commit=True) as con:
+            rows = con.execute(
+                "SELECT key, value FROM responses WHERE SUBSTR(value, 1, 1) != ?",
+                (ZLIB_HEADER,),
+            ).fetchall()
+            con.executemany(
+                "UPDATE responses SET value = ? WHERE key = ?",
+                [(compress(value), key) for key, value in rows],
+            )
+            stats["compressed"] = len(rows)
+            (size,) = con.execute(
+                "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM responses"
+            ).fetchone()
+        with self._lock:
+            self._size = size
+
+        unused_since = time.time() - max_age if max_age is not None else None
+        stats["evicted"] = self.evict(self.max_size, unused_since=unused_since)
+        return stats
+
+    def report(self) -> dict:
+        self.flush_access_times()
+        with self.responses.connection() as con:
+            entries, compressed = con.execute(
+                "SELECT COUNT(*), COALESCE(SUM(SUBSTR(value, 1, 1) = ?), 0) "
+                "FROM responses",
+                (ZLIB_HEADER,),
+            ).fetchone()
+            oldest, newest = con.execute(
+                "SELECT MIN(last_used), MAX(last_used) FROM access "
+                "WHERE key IN (SELECT key FROM responses)"
+            ).fetchone()
+        return dict(
+            entries=entries,
+            compressed=compressed,
+            stored_bytes=self.size,
+            file_bytes=self.responses.size(),
+            max_size=self.max_size,
+            oldest_use=format_time(oldest),
+            newest_use=format_time(newest),
+        )
+
+    def vacuum(self):
+        """Return the space freed by evictions to the file system."""
+        self.flush_access_times()
+        self.responses.vacuum()
+
+    def close(self):
+        self.flush_access_times()
+        super().close()
+
+
+def format_time(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+parser = argparse.ArgumentParser(
+    description="Report on, compact or vacuum the cache of fetched pages."
+)
+parser.add_argument("command", choices=("report", "compact", "vacuum"))
+parser.add_argument(
+    "-c",
+    "--cache",
+    dest="cache_name",
+    default="requests_cache",
+    help="Name of the cache (default: 'requests_cache', i.e. requests_cache.sqlite)",
+)
+parser.add_argument(
+    "--max-mb",
+    dest="max_mb",
+    type=int,
+    default=DEFAULT_MAX_SIZE // 2 ** 20,
+    help=(
+        "Size (in MiB) to shrink the stored responses to when compacting "
+        f"(default: {DEFAULT_MAX_SIZE // 2 ** 20})"
+    ),
+)
+parser.add_argument(
+    "--max-age-days",
+    dest="max_age_days",
+    type=float,
+    default=None,
+    help="When compacting, also evict responses not used for this many days",
+)
+
+
+if __name__ == "__main__":
+
+    args = parser.parse_args()
+
+    cache = BoundedSQLiteCache(args.cache_name, max_size=args.max_mb * 2 ** 20)
+    if args.command == "compact":
+        max_age = args.max_age_days * 24 * 60 * 60 if args.max_age_days else None
+        stats = cache.compact(max_age=max_age)
+        print(
+            f"Removed {stats['uncacheable']} uncacheable responses, compressed "
+            f"{stats['compressed']} and evicted {stats['evicted']}"
+        )
+        cache.vacuum()
+    elif args.command == "vacuum":
+        cache.vacuum()
+    for name, value in cache.report().items():
+        print(f"{name}: {value}")
+    cache.close()
@@ -0,0 +1,135 @@
+import json
+import os
+import sqlite3
+import threading
+
+from typing import Optional
+
+# Local imports
+from records import TutorialRecord
+from store import STORE_VERSION, decode_record, encode_record
+
+
+class CrawlJournal:
+    """SQLite-backed checkpoint journal of the work completed by a run.
+
+    Completed topic files, pages fetched from the server and fully extracted
+    tutorials are recorded as the run goes, and committed immediately, so
+    they survive an `UnsuccessfulGet` or the process being killed. When the
+    run is resumed, completed topic files are not written again, recorded
+    tutorials are not extracted again and recorded pages are not fetched
+    again (only read from the requests cache). Once a run completes, its
+    journal is cleared.
+
+    A journal is only resumed by a run with the same `options` (the command
+    line options that affect the output); otherwise it is cleared first.
+    """
+
+    def __init__(
+        self,
+        path: str = "crawl_journal.sqlite",
+        options: Optional[dict] = None,
+        resume: bool = False,
+    ):
+        self.path = path
+        self.reused_tutorials = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS run (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS topics (name TEXT PRIMARY KEY, path TEXT)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY)"
+        )
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS tutorials "
+            f"({', '.join(TutorialRecord._fields)}, PRIMARY KEY (url))"
+        )
+
+        # Tutorials are encoded like those of the tutorial store
+        options = json.dumps(
+            dict(options or {}, store_version=STORE_VERSION), sort_keys=True
+        )
+        row = self._connection.execute(
+            "SELECT value FROM run WHERE key = 'options'"
+        ).fetchone()
+        self.resumed = resume and row is not None and row[0] == options
+        with self._connection:  # Single transaction
+            if not self.resumed:
+                self._clear()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO run VALUES ('options', ?)", (options,)
+            )
+
+        (self.resumable_tutorials,) = self._connection.execute(
+            "SELECT COUNT(*) FROM tutorials"
+        ).fetchone()
+        self._pages = {
+            url for (url,) in self._connection.execute("SELECT url FROM pages")
+        }
+
+    def is_topic_done(self, name: str, path: str) -> bool:
+        """Whether the file of topic `name` was completely written to `path`."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT path FROM topics WHERE name = ?", (name,)
+            ).fetchone()
+        return row is not None and row[0] == path and os.path.exists(path)
+
+    def put_topic(self, name: str, path: str):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO topics VALUES (?, ?)", (name, path)
+            )
+            self._connection.commit()
+
+    def has_page(self, url: str) -> bool:
+        return url in self._pages
+
+    def put_page(self, url: str):
+        with self._lock:
+            if url in self._pages:
+                return
+            self._pages.add(url)
+            self._connection.execute("INSERT INTO pages VALUES (?)", (url,))
+            self._connection.commit()
+
+    def get_tutorial(self, url: str) -> Optional[TutorialRecord]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM tutorials WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.reused_tutorials += 1
+        return decode_record(row)
+
+    def put_tutorial(self, record: TutorialRecord):
+        row = encode_record(record)
+        placeholders = ", ".join("?" for _ in row)
+        with self._lock:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO tutorials VALUES ({placeholders})", row
+            )
+            self._connection.commit()
+
+    def finish(self):
+        """Clear the journal of a completed run."""
+        with self._lock:
+            with self._connection:
+                self._clear()
+            self._pages.clear()
+
+    def _clear(self):
+        for table in ("run", "topics", "pages", "tutorials"):
+            self._connection.execute(f"DELETE FROM {table}")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
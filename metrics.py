@@ -0,0 +1,118 @@
+import json
+import threading
+import time
+
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+
+class Metrics:
+    """Counters and timers for each stage of a run, broken down by topic.
+
+    A stage is timed with `timer` (which also counts how often it ran) and
+    anything else is counted with `count`. Work that is shared by all topics
+    (e.g. comment count queries) is recorded without a topic. Stages may nest;
+    for instance, a comment query includes the network time of its request.
+
+    Every duration is also kept (for all topics together), so that the tail
+    of each stage's distribution can be reported (see `percentiles`).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)  # (topic, name) -> count
+        self._timers = defaultdict(lambda: [0, 0.0])  # (topic, stage) -> [n, s]
+        self._durations = defaultdict(list)  # stage -> [s, ...]
+
+    def count(self, name: str, topic: Optional[str] = None, n: int = 1):
+        with self._lock:
+            self._counters[topic, name] += n
+
+    def add_time(self, stage: str, seconds: float, topic: Optional[str] = None):
+        with self._lock:
+            timer = self._timers[topic, stage]
+            timer[0] += 1
+            timer[1] += seconds
+            self._durations[stage].append(seconds)
+
+    @contextmanager
+    def timer(self, stage: str, topic: Optional[str] = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start, topic)
+
+    def percentiles(self, stage: str) -> dict:
+        """Return the median, 90th and 99th percentiles and maximum duration
+        of `stage`, in seconds (None if it never ran)."""
+        with self._lock:
+            durations = sorted(self._durations.get(stage, ()))
+        return {
+            "p50": percentile(durations, 50, presorted=True),
+            "p90": percentile(durations, 90, presorted=True),
+            "p99": percentile(durations, 99, presorted=True),
+            "max": durations[-1] if durations else None,
+        }
+
+    def as_dict(self) -> dict:
+        """Totals over all topics, followed by the totals of each topic.
+
+        Total timers also include the percentiles of their durations.
+        """
+        with self._lock:
+            counters = list(self._counters.items())
+            timers = [(key, tuple(value)) for key, value in self._timers.items()]
+
+        def empty():
+            return {"counters": {}, "timers": {}}
+
+        total = empty()
+        topics = defaultdict(empty)
+        for (topic, name), n in sorted(counters, key=sort_key):
+            total["counters"][name] = total["counters"].get(name, 0) + n
+            if topic is not None:
+                topics[topic]["counters"][name] = n
+        for (topic, stage), (n, seconds) in sorted(timers, key=sort_key):
+            count, total_seconds = total["timers"].get(stage, (0, 0.0))
+            total["timers"][stage] = (count + n, total_seconds + seconds)
+            if topic is not None:
+                topics[topic]["timers"][stage] = (n, seconds)
+
+        def timer_dicts(entry):
+            entry["timers"] = {
+                stage: {"count": n, "seconds": round(seconds, 6)}
+                for stage, (n, seconds) in entry["timers"].items()
+            }
+            return entry
+
+        total = timer_dicts(total)
+        for stage, timer in total["timers"].items():
+            timer.update(
+                (name, round(seconds, 6) if seconds is not None else None)
+                for name, seconds in self.percentiles(stage).items()
+            )
+        return {
+            "total": total,
+            "topics": {topic: timer_dicts(entry) for topic, entry in topics.items()},
+        }
+
+    def dump(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=2)
+            f.write("\n")
+
+
+def percentile(values, p, presorted=False):
+    """Return the `p`th percentile of `values` (nearest rank), or None."""
+    if not values:
+        return None
+    if not presorted:
+        values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def sort_key(item):
+    (topic, name), _ = item
+    return (topic or "", name)
@@ -0,0 +1,127 @@
+import random
+import threading
+import time
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """Token bucket shared by every request made on behalf of a Summarizer.
+
+    Tokens accrue at `rate` per second, up to `capacity`, and each request to
+    the server consumes one. When the server responds with 429, the bucket is
+    emptied until the `Retry-After` time has passed and `rate` is halved.
+    Every successful request afterwards raises `rate` by `increase`, up to
+    `max_rate`, so the bucket settles near the highest rate the server accepts.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        capacity: float = 5.0,
+        max_rate: Optional[float] = None,
+        min_rate: float = 0.1,
+        increase: float = 0.05,
+    ):
+        assert rate > 0 and capacity >= 1
+        self.rate = rate
+        self.capacity = capacity
+        self.max_rate = rate if max_rate is None else max_rate
+        self.min_rate = min(min_rate, rate)
+        self.increase = increase
+
+        self.throttled = 0  # Number of distinct 429 episodes
+
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def try_acquire(self) -> bool:
+        """Consume a token if one is available right away."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self._blocked_until and self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def throttle(self, retry_after: Optional[float] = None):
+        """Back off after the server responded with 429 (Too Many Requests)."""
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._blocked_until:
+                # Workers that were already in flight when the first 429 arrived
+                # will report the same episode; only slow down once per episode.
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.throttled += 1
+            delay = retry_after if retry_after is not None else 1 / self.rate
+            self._blocked_until = max(self._blocked_until, now + delay)
+            self._tokens = 0
+            self._updated = self._blocked_until
+
+    def reward(self):
+        """Record a request that the server accepted."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def _refill(self, now):
+        if now > self._updated:
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def __repr__(self):
+        cls = type(self).__name__
+        return f"{cls}(rate={self.rate:.2f}, capacity={self.capacity})"
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Return how long to wait before retrying a request that failed `attempt`
+    times (counting from 1), with "full jitter": a random delay of up to
+    `base * 2 ** (attempt - 1)` seconds, and at most `cap` seconds.
+
+    Randomizing the whole delay keeps workers whose requests failed at the
+    same time from retrying in lockstep.
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Return the number of seconds requested by a `Retry-After` header.
+
+    The header may contain either a number of seconds or an HTTP-date.
+    Returns None if `value` is empty or cannot be parsed.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
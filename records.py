@@ -0,0 +1,126 @@
+from collections import namedtuple
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+Author = namedtuple("Author", "name url")
+Tag = namedtuple("Tag", "name url")
+Comments = namedtuple("Comments", "count url")
+Card = namedtuple("Card", "title url is_premium date tags")
+
+_TutorialRecord = namedtuple(
+    "TutorialRecord",
+    [
+        "url",
+        "fingerprint",
+        "title",
+        "is_premium",
+        "date",
+        "tags",
+        "behind_paywall",
+        "author",
+        "has_comments",
+        "disqus_identifier",
+        "comments_url",
+        "comment_count",
+        "markdown_introduction",
+    ],
+)
+
+
+class TutorialRecord(_TutorialRecord):
+    """Compact, picklable record of a tutorial's values.
+
+    Unlike a `Tutorial`, a record has no per-instance `__dict__` and no
+    references to its topic or summarizer, so large numbers of them are cheap
+    to hold, sort and pickle. A record built from a card (see `card_record`)
+    only holds the values listed on topic pages; the fields that require the
+    article page are None until it is hydrated by a `TutorialLoader`.
+    """
+
+    __slots__ = ()
+
+    @property
+    def is_hydrated(self) -> bool:
+        return self.markdown_introduction is not None
+
+    @property
+    def tag_names(self) -> Tuple[str]:
+        return tuple(tag.name for tag in self.tags)
+
+    @property
+    def has_date(self) -> bool:
+        return self.date is not None
+
+    @property
+    def has_author(self) -> bool:
+        return self.author is not None
+
+    @property
+    def comments(self) -> Comments:
+        if self.has_comments:
+            return Comments(self.comment_count, self.comments_url)
+        raise AttributeError(f"{self!r} does not have any comments")
+
+    @property
+    def markdown_title(self) -> str:
+        return format_title(self.title, self.url)
+
+    @property
+    def has_metadata_string(self) -> bool:
+        return bool(self.author is not None and self.tags and self.has_comments)
+
+    @property
+    def markdown_metadata_string(self) -> str:
+        if self.has_metadata_string:
+            return format_metadata_string(
+                self.author, self.date, self.tags, self.comment_count, self.comments_url
+            )
+        raise AttributeError(f"{self!r} does not have a metadata string")
+
+
+def card_record(card: Card, url: str) -> TutorialRecord:
+    """Return an unhydrated record of the tutorial listed by `card`."""
+    return TutorialRecord(
+        url=url,
+        fingerprint=None,
+        title=card.title,
+        is_premium=card.is_premium,
+        date=card.date,
+        tags=card.tags,
+        behind_paywall=None,
+        author=None,
+        has_comments=None,
+        disqus_identifier=None,
+        comments_url=None,
+        comment_count=None,
+        markdown_introduction=None,
+    )
+
+
+def format_title(title: str, url: str) -> str:
+    return f"## [{title}]({url})"
+
+
+def format_metadata_string(
+    author: Optional[Author],
+    date: Optional[datetime],
+    tags: Tuple[Tag],
+    comment_count: Optional[int],
+    comments_url: Optional[str],
+) -> str:
+    """Format the metadata line of a tutorial; unknown parts are left out."""
+    parts = []
+    if author is not None:
+        parts.append(f"by [{author.name}]({author.url})")
+    if date is not None:
+        parts.append(f"on {date.strftime('%a, %d %b %Y')}")
+
+    tag_links = ", ".join([f"[{tag.name}]({tag.url})" for tag in tags])
+    parts.append(f"with tags: {tag_links}")
+
+    if comment_count is not None:
+        comments_text = "{} comments" if comment_count != 1 else "{} comment"
+        comments_text = comments_text.format(comment_count)
+        parts.append(f"([{comments_text}]({comments_url}))")
+    return " ".join(parts)
@@ -0,0 +1,518 @@
+"""Sharded crawls: several processes (or machines) extract the tutorials.
+
+A crawl is split into three steps that share a SQLite work queue:
+
+    python shard.py plan --include-premium        # list topics, queue tasks
+    python shard.py work --workers 4              # run one or more of these
+    python shard.py merge                         # write the markdown files
+
+`plan` reads every selected topic listing, then queues the tutorials found
+there (each once, even if listed under several topics) in tasks of
+`--chunk-size` tutorials, so big topics are spread over several workers.
+Each `work` process claims tasks until none are left, extracts their
+tutorials and saves the complete records in the queue. `merge` writes the
+same files as `fetch.py` from the saved records, without fetching anything.
+
+To spread the work over several machines, put the queue on a shared file
+system and run `work` on each of them (from its own working directory, for
+its caches). `python shard.py run --shards N` does all three steps on this
+machine, with N worker processes.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Tuple
+
+# Local imports
+from export import CsvWriter, JsonLinesWriter
+from fetch import (
+    OutputManifest,
+    parse_fields,
+    topic_filename,
+    topic_heading,
+    write_markdown,
+)
+from records import TutorialRecord
+from store import STORE_VERSION, TutorialStore, decode_record, encode_record
+from summarizer import ARTICLE_FIELDS, Summarizer, TutorialLoader
+
+
+QUEUE_FILE = "crawl_queue.sqlite"
+
+# Tasks claimed longer ago than this (e.g. by a worker that was killed) are
+# handed out again
+DEFAULT_LEASE = 10 * 60  # Seconds
+
+
+class WorkQueue:
+    """SQLite-backed queue of tutorial extraction tasks, shared by processes.
+
+    The queue holds the planned topics (in order), the records of the
+    tutorials listed under each topic (in listing order) and the tasks. A
+    task is a list of tutorial urls; it is claimed by one worker at a time,
+    and is complete once the worker has saved the hydrated records of its
+    tutorials. Claims are made in `BEGIN IMMEDIATE` transactions, so that
+    concurrent workers never claim the same task.
+
+    The default rollback journal is used (not WAL), since WAL does not work
+    on network file systems.
+    """
+
+    def __init__(self, path: str = QUEUE_FILE):
+        self.path = path
+        # Transactions are managed explicitly (see `_transaction`)
+        self._connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        with self._transaction():
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS options (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS topics "
+                "(position INTEGER PRIMARY KEY, name TEXT, url TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS listings (topic TEXT, position INTEGER, "
+                "url TEXT, PRIMARY KEY (topic, position))"
+            )
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS tutorials "
+                f"({', '.join(TutorialRecord._fields)}, PRIMARY KEY (url))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS tasks (id INTEGER PRIMARY KEY, "
+                "urls TEXT, owner TEXT, claimed_at REAL, done INTEGER DEFAULT 0)"
+            )
+
+    @contextmanager
+    def _transaction(self):
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def plan(self, options: dict, topics: Iterable[Tuple], chunk_size: int = 25):
+        """Replace the queue's contents with the given topics and their tasks.
+
+        `topics` are (name, url, records) tuples, with records in listing order.
+        """
+        seen = set()
+        with self._transaction():
+            for table in ("options", "topics", "listings", "tutorials", "tasks"):
+                self._connection.execute(f"DELETE FROM {table}")
+            options = dict(options, store_version=STORE_VERSION)
+            self._connection.executemany(
+                "INSERT INTO options VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in options.items()],
+            )
+
+            pending = []
+            for position, (name, url, records) in enumerate(topics):
+                self._connection.execute(
+                    "INSERT INTO topics VALUES (?, ?, ?)", (position, name, url)
+                )
+                for i, record in enumerate(records):
+                    self._connection.execute(
+                        "INSERT INTO listings VALUES (?, ?, ?)", (name, i, record.url)
+                    )
+                    if record.url not in seen:
+                        seen.add(record.url)
+                        self._put_records([record])
+                        pending.append(record.url)
+
+            if options["fields"]:  # Otherwise, cards are all that is written
+                for start in range(0, len(pending), chunk_size):
+                    urls = pending[start : start + chunk_size]
+                    self._connection.execute(
+                        "INSERT INTO tasks (urls) VALUES (?)", (json.dumps(urls),)
+                    )
+        return len(seen)
+
+    def options(self) -> dict:
+        rows = self._connection.execute("SELECT key, value FROM options")
+        return {key: json.loads(value) for key, value in rows}
+
+    def topics(self) -> List[Tuple[str, str]]:
+        """Return the (name, url) of every planned topic, in order."""
+        return self._connection.execute(
+            "SELECT name, url FROM topics ORDER BY position"
+        ).fetchall()
+
+    def claim(self, owner: str, lease: float = DEFAULT_LEASE) -> Optional[tuple]:
+        """Claim the next available task for `owner`.
+
+        Returns the task's id and records, or None if every task is either
+        complete or claimed by another worker within the last `lease` seconds.
+        """
+        now = time.time()
+        with self._transaction():
+            row = self._connection.execute(
+                "SELECT id, urls FROM tasks WHERE done = 0 "
+                "AND (owner IS NULL OR claimed_at < ?) ORDER BY id LIMIT 1",
+                (now - lease,),
+            ).fetchone()
+            if row is None:
+                return None
+            task_id, urls = row
+            self._connection.execute(
+                "UPDATE tasks SET owner = ?, claimed_at = ? WHERE id = ?",
+                (owner, now, task_id),
+            )
+        return task_id, self._get_records(json.loads(urls))
+
+    def complete(self, task_id: int, records: Iterable[TutorialRecord]):
+        """Save the hydrated `records` of a task and mark it as complete."""
+        with self._transaction():
+            self._put_records(records)
+            self._connection.execute(
+                "UPDATE tasks SET done = 1 WHERE id = ?", (task_id,)
+            )
+
+    def progress(self) -> dict:
+        total, done, claimed = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(done), 0), "
+            "COALESCE(SUM(done = 0 AND owner IS NOT NULL), 0) FROM tasks"
+        ).fetchone()
+        return dict(tasks=total, done=done, claimed=claimed)
+
+    def listing(self, topic: str) -> List[TutorialRecord]:
+        """Return the records of the tutorials listed under `topic`, in order."""
+        rows = self._connection.execute(
+            "SELECT t.* FROM listings AS l JOIN tutorials AS t ON t.url = l.url "
+            "WHERE l.topic = ? ORDER BY l.position",
+            (topic,),
+        ).fetchall()
+        return [decode_record(row) for row in rows]
+
+    def _get_records(self, urls: List[str]) -> List[TutorialRecord]:
+        placeholders = ", ".join("?" for _ in urls)
+        rows = self._connection.execute(
+            f"SELECT * FROM tutorials WHERE url IN ({placeholders})", urls
+        ).fetchall()
+        records = {record.url: record for record in map(decode_record, rows)}
+        return [records[url] for url in urls]
+
+    def _put_records(self, records: Iterable[TutorialRecord]):
+        rows = [encode_record(record) for record in records]
+        if rows:
+            placeholders = ", ".join("?" for _ in rows[0])
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO tutorials VALUES ({placeholders})", rows
+            )
+
+    def close(self):
+        self._connection.close()
+
+
+def plan(args) -> int:
+    summarizer = Summarizer(
+        selected_topics=args.selected_topics,
+        include_premium=args.include_premium,
+        workers=args.workers,
+        requests_per_second=args.requests_per_second,
+        verbose=args.verbose,
+    )
+    topics = (
+        (topic.name, topic.url, list(topic.records)) for topic in summarizer.topics
+    )
+    options = dict(include_premium=args.include_premium, fields=list(args.fields))
+    queue = WorkQueue(args.queue_path)
+    try:
+        tutorials = queue.plan(options, topics, chunk_size=args.chunk_size)
+        progress = queue.progress()
+    finally:
+        queue.close()
+    print(f"Queued {tutorials} tutorials in {progress['tasks']} tasks")
+    return progress["tasks"]
+
+
+def work(args) -> int:
+    """Extract the tutorials of queued tasks until none are left."""
+    queue = WorkQueue(args.queue_path)
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        # The topics were validated when planning, so the home page is not
+        # needed to validate them again
+        Summarizer._available_topics = dict(queue.topics())
+        summarizer = Summarizer(
+            selected_topics=[],
+            include_premium=queue.options()["include_premium"],
+            workers=args.workers,
+            requests_per_second=args.requests_per_second,
+            store_path=args.store_path or None,
+            processes=args.processes,
+            verbose=args.verbose,
+        )
+        loader = TutorialLoader(summarizer)
+
+        completed = 0
+        while True:
+            task = queue.claim(owner, lease=args.lease)
+            if task is None:
+                break
+            task_id, records = task
+            queue.complete(task_id, list(loader.load_all(records)))
+            completed += 1
+    finally:
+        queue.close()
+    print(f"{owner} completed {completed} tasks")
+    return completed
+
+
+def merge(args):
+    """Write the markdown file of each planned topic (and the exports).
+
+    As with fetch.py, files whose tutorials have not changed are not written.
+    """
+    queue = WorkQueue(args.queue_path)
+    try:
+        progress = queue.progress()
+        if progress["done"] < progress["tasks"]:
+            remaining = progress["tasks"] - progress["done"]
+            raise SystemExit(f"{remaining} tasks are not complete yet")
+
+        fields = tuple(queue.options()["fields"])
+        if not os.path.exists(args.output_dir):
+            os.mkdir(args.output_dir)
+
+        exporters = []
+        if args.jsonl_path:
+            exporters.append(JsonLinesWriter(args.jsonl_path))
+        if args.csv_path:
+            exporters.append(CsvWriter(args.csv_path))
+
+        manifest = OutputManifest(force=args.force)
+        complete = False
+        try:
+            for name, _ in queue.topics():
+                path = os.path.join(args.output_dir, topic_filename(name))
+                write_markdown(
+                    path,
+                    topic_heading(name),
+                    queue.listing(name),
+                    args.queue_depth,
+                    name=name,
+                    fields=fields,
+                    exporters=exporters,
+                    manifest=manifest,
+                )
+            complete = True
+        finally:
+            for exporter in exporters:
+                exporter.close(complete)
+            manifest.save()
+        manifest.print_summary()
+    finally:
+        queue.close()
+
+
+def run(args):
+    """Plan, extract with `args.shards` local worker processes, then merge."""
+    if plan(args):
+        # The requests cache was created by `plan`; the store is created before
+        # the workers share it too
+        if args.store_path:
+            TutorialStore(args.store_path).close()
+        command = [
+            sys.executable,
+            os.path.abspath(__file__),
+            "work",
+            f"--queue={args.queue_path}",
+            f"--workers={args.workers}",
+            f"--processes={args.processes}",
+            # The rate limit is shared by the worker processes
+            f"--rate={args.requests_per_second / args.shards}",
+            f"--store={args.store_path}",
+        ]
+        if not args.verbose:
+            command.append("--quiet")
+        workers = [subprocess.Popen(command) for _ in range(args.shards)]
+        failed = [worker for worker in workers if worker.wait() != 0]
+        if failed:
+            raise SystemExit(f"{len(failed)} worker processes failed")
+    merge(args)
+
+
+parser = argparse.ArgumentParser(
+    description=(
+        "Crawl Real Python with several worker processes or machines that "
+        "share a work queue, then write the same files as fetch.py."
+    )
+)
+subparsers = parser.add_subparsers(dest="command")
+subparsers.required = True
+
+plan_parser = subparsers.add_parser("plan", help="Queue the tutorials of topics")
+work_parser = subparsers.add_parser("work", help="Extract queued tutorials")
+merge_parser = subparsers.add_parser("merge", help="Write the markdown files")
+run_parser = subparsers.add_parser(
+    "run", help="Plan, work with local processes and merge"
+)
+
+for subparser in (plan_parser, work_parser, merge_parser, run_parser):
+    subparser.add_argument(
+        "--queue",
+        dest="queue_path",
+        default=QUEUE_FILE,
+        help=f"SQLite file of the work queue (default: '{QUEUE_FILE}')",
+    )
+
+for subparser in (plan_parser, run_parser):
+    subparser.add_argument(
+        "selected_topics",
+        metavar="topic",
+        nargs="*",
+        default="all",
+        help="Only crawl the given topic(s) (default: 'all')",
+    )
+    subparser.add_argument(
+        "-p",
+        "--include-premium",
+        dest="include_premium",
+        action="store_true",
+        help="Include premium tutorials (default: do not include premium)",
+    )
+    subparser.add_argument(
+        "--fields",
+        dest="fields",
+        type=parse_fields,
+        default=ARTICLE_FIELDS,
+        help=(
+            "Comma-separated fields to write, as with fetch.py "
+            f"(default: {','.join(ARTICLE_FIELDS)})"
+        ),
+    )
+    subparser.add_argument(
+        "--chunk-size",
+        dest="chunk_size",
+        type=int,
+        default=25,
+        help="Number of tutorials in each task (default: 25)",
+    )
+
+for subparser in (plan_parser, work_parser, run_parser):
+    subparser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        type=int,
+        default=1,
+        help="Number of pages each process fetches concurrently (default: 1)",
+    )
+    subparser.add_argument(
+        "-r",
+        "--rate",
+        dest="requests_per_second",
+        type=float,
+        default=5.0,
+        help=(
+            "Maximum number of uncached requests per second, of each process "
+            "(of all worker processes, for `run`) (default: 5)"
+        ),
+    )
+    subparser.add_argument(
+        "-q",
+        "--quiet",
+        dest="verbose",
+        action="store_false",
+        help="Do not print every fetched page",
+    )
+
+for subparser in (work_parser, run_parser):
+    subparser.add_argument(
+        "--processes",
+        dest="processes",
+        type=int,
+        default=0,
+        help=(
+            "Number of processes each worker uses to parse pages; raises "
+            "--workers to at least this number (default: 0)"
+        ),
+    )
+    subparser.add_argument(
+        "--store",
+        dest="store_path",
+        default="tutorial_store.sqlite",
+        help=(
+            "SQLite file in which to keep extracted tutorials; use an empty "
+            "string to disable (default: 'tutorial_store.sqlite')"
+        ),
+    )
+
+work_parser.add_argument(
+    "--lease",
+    dest="lease",
+    type=float,
+    default=DEFAULT_LEASE,
+    help=(
+        "Seconds after which a task claimed by another worker that has not "
+        f"completed it is claimed again (default: {DEFAULT_LEASE})"
+    ),
+)
+
+run_parser.add_argument(
+    "-n",
+    "--shards",
+    dest="shards",
+    type=int,
+    default=os.cpu_count() or 1,
+    help="Number of worker processes (default: the number of CPUs)",
+)
+
+for subparser in (merge_parser, run_parser):
+    subparser.add_argument(
+        "-o",
+        "--output-dir",
+        dest="output_dir",
+        default="generated_markdown",
+        help="Directory of the markdown files (default: 'generated_markdown')",
+    )
+    subparser.add_argument(
+        "--jsonl",
+        dest="jsonl_path",
+        default=None,
+        help="Also export the written tutorials to this JSON Lines file",
+    )
+    subparser.add_argument(
+        "--csv",
+        dest="csv_path",
+        default=None,
+        help="Also export the written tutorials to this CSV file",
+    )
+    subparser.add_argument(
+        "--force",
+        dest="force",
+        action="store_true",
+        help="Rewrite every file, even if its tutorials have not changed",
+    )
+    subparser.add_argument(
+        "--queue-depth",
+        dest="queue_depth",
+        type=int,
+        default=64,
+        help="Number of rendered tutorials buffered for the writer (default: 64)",
+    )
+
+
+if __name__ == "__main__":
+
+    args = parser.parse_args()
+
+    if args.command == "plan":
+        plan(args)
+    elif args.command == "work":
+        work(args)
+    elif args.command == "merge":
+        merge(args)
+    else:
+        run(args)
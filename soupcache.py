@@ -0,0 +1,86 @@
+import threading
+
+from collections import OrderedDict, namedtuple
+
+
+CacheStats = namedtuple("CacheStats", "hits misses evictions entries size max_size")
+
+# A parsed document occupies many times more memory than the html it was built
+# from. A factor of ~20 is a conservative estimate for Real Python pages.
+SOUP_BYTES_PER_HTML_BYTE = 20
+
+
+class SoupCache:
+    """Least-recently-used cache of parsed documents, bounded by memory.
+
+    The memory used by each entry is estimated from the length of the html it
+    was parsed from (see `SOUP_BYTES_PER_HTML_BYTE`). When the estimated total
+    exceeds `max_size` bytes, least-recently-used entries are evicted. At
+    least one entry is always kept, even if it alone exceeds `max_size`.
+    """
+
+    def __init__(self, max_size: int = 256 * 2 ** 20):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (soup, estimated size)
+        self._size = 0
+
+    def get(self, key):
+        """Return the cached value for `key`, or None (counted as a miss)."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                soup, _ = self._entries[key]
+                return soup
+            self.misses += 1
+            return None
+
+    def put(self, key, soup, html_length: int):
+        with self._lock:
+            if key in self._entries:
+                _, old_size = self._entries.pop(key)
+                self._size -= old_size
+            size = html_length * SOUP_BYTES_PER_HTML_BYTE
+            self._entries[key] = (soup, size)
+            self._size += size
+            self._evict()
+
+    def resize(self, max_size: int):
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self.hits,
+                self.misses,
+                self.evictions,
+                len(self._entries),
+                self._size,
+                self.max_size,
+            )
+
+    def _evict(self):
+        while self._size > self.max_size and len(self._entries) > 1:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from datetime import datetime
+from typing import List, Optional
+
+# Local imports
+from records import Author, Card, Tag, TutorialRecord
+
+
+# Increment whenever extraction changes in a way that invalidates stored records
+STORE_VERSION = 2
+
+# Attempts at setting up a store that other processes are setting up too
+SETUP_ATTEMPTS = 10
+
+
+def fingerprint(content: bytes) -> str:
+    """Return a fingerprint of a page's content, used to detect changes."""
+    return hashlib.sha1(content).hexdigest()
+
+
+class TutorialStore:
+    """SQLite-backed store of fully extracted tutorial records.
+
+    Records are keyed by url and are only returned if the fingerprint of the
+    page they were extracted from matches, so a changed page is always
+    extracted again. Tags and author are stored as JSON, dates as ISO strings.
+
+    The store also remembers the cards listed under each topic, which allows
+    incremental crawls to stop paginating at the first already-known page.
+    """
+
+    def __init__(self, path: str = "tutorial_store.sqlite"):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        # Several processes may open a new store at once (see shard.py).
+        # Switching to WAL does not wait for their locks, so it is retried.
+        for attempt in range(1, SETUP_ATTEMPTS + 1):
+            try:
+                self._setup()
+                break
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) or attempt == SETUP_ATTEMPTS:
+                    raise
+                time.sleep(0.05 * attempt)
+
+    def _setup(self):
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        # The version is checked and the tables created in a single (write)
+        # transaction, so that no other process drops them in between
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+            if version != STORE_VERSION:
+                self._connection.execute("DROP TABLE IF EXISTS tutorials")
+                self._connection.execute("DROP TABLE IF EXISTS topic_cards")
+                self._connection.execute(f"PRAGMA user_version={STORE_VERSION}")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS tutorials "
+                f"({', '.join(TutorialRecord._fields)}, PRIMARY KEY (url))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS topic_cards (topic, position, title, "
+                "url, is_premium, date, tags, PRIMARY KEY (topic, position))"
+            )
+        except BaseException:
+            self._connection.rollback()
+            raise
+        self._connection.commit()
+
+    def get(self, url: str, fingerprint: str) -> Optional[TutorialRecord]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM tutorials WHERE url = ? AND fingerprint = ?",
+                (url, fingerprint),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return decode_record(row)
+
+    def put(self, record: TutorialRecord):
+        row = encode_record(record)
+        placeholders = ", ".join("?" for _ in row)
+        with self._lock:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO tutorials VALUES ({placeholders})", row
+            )
+            self._connection.commit()
+
+    def get_cards(self, topic: str) -> List:
+        """Return the cards stored for `topic`, in listing order."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT title, url, is_premium, date, tags FROM topic_cards "
+                "WHERE topic = ? ORDER BY position",
+                (topic,),
+            ).fetchall()
+        return [decode_card(row) for row in rows]
+
+    def put_cards(self, topic: str, cards: List):
+        """Replace the cards stored for `topic`."""
+        rows = [(topic, i, *encode_card(card)) for i, card in enumerate(cards)]
+        with self._lock:
+            with self._connection:  # Single transaction
+                self._connection.execute(
+                    "DELETE FROM topic_cards WHERE topic = ?", (topic,)
+                )
+                self._connection.executemany(
+                    "INSERT INTO topic_cards VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM tutorials"
+            ).fetchone()
+        return count
+
+
+def encode_record(record: TutorialRecord) -> tuple:
+    return record._replace(
+        date=record.date.isoformat() if record.date is not None else None,
+        tags=json.dumps(record.tags),
+        author=json.dumps(record.author),
+    )
+
+
+def encode_card(card: Card) -> tuple:
+    return card._replace(
+        date=card.date.isoformat() if card.date is not None else None,
+        tags=json.dumps(card.tags),
+    )
+
+
+def decode_card(row: tuple) -> Card:
+    card = Card(*row)
+    return card._replace(
+        is_premium=bool(card.is_premium),
+        date=datetime.fromisoformat(card.date) if card.date is not None else None,
+        tags=tuple(Tag(*tag) for tag in json.loads(card.tags)),
+    )
+
+
+def decode_record(row: tuple) -> TutorialRecord:
+    record = TutorialRecord(*row)
+    author = json.loads(record.author)
+    return record._replace(
+        is_premium=bool(record.is_premium),
+        date=datetime.fromisoformat(record.date) if record.date is not None else None,
+        tags=tuple(Tag(*tag) for tag in json.loads(record.tags)),
+        behind_paywall=bool(record.behind_paywall),
+        author=Author(*author) if author is not None else None,
+        has_comments=bool(record.has_comments),
+    )
@@ -0,0 +1,29 @@
+import pytest
+
+# Local imports
+import benchmark
+
+from conftest import write_corpus
+
+ARTICLES = [f"tutorial-{i}" for i in range(1, 6)]
+
+
+@pytest.mark.parametrize("workers", ["1", "4"])
+def test_full_and_incremental_crawls(corpus_dir, workers):
+    # Two cards per page, but the nav does not link to the third page
+    write_corpus(corpus_dir, {"basics": ARTICLES}, nav_pages=2)
+    args = benchmark.parser.parse_args(
+        ["run", "--corpus", str(corpus_dir), "--workers", workers]
+    )
+    full, first_incremental, incremental = benchmark.run_benchmarks(args)
+
+    # The home page, every listing page (including the one missing from the
+    # nav), every article and a single comment count query
+    assert full["tutorials"] == len(ARTICLES)
+    assert full["server"]["requests"] == 1 + 3 + len(ARTICLES) + 1
+    assert full["server"]["200"] == full["server"]["requests"]
+
+    # Only the first listing page is revalidated, and it has not changed
+    for result in (first_incremental, incremental):
+        assert result["tutorials"] == len(ARTICLES)
+        assert result["server"]["requests"] == result["server"]["304"] == 1
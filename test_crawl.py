@@ -0,0 +1,150 @@
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+
+# Local imports
+import summarizer
+
+from fetch import write_selected
+from summarizer import ARTICLE_FIELDS, PAYWALL_INTRODUCTION, TutorialLoader
+
+SLUGS = [f"tutorial-{i}" for i in range(1, 6)]
+
+
+def test_topic_threads_extract_shared_tutorials_once(replay_server, make_summarizer):
+    server = replay_server({"advanced": SLUGS, "basics": SLUGS})
+    s = make_summarizer(server, eager=True, fields=("author", "introduction"))
+
+    def write(topic):
+        return [
+            (t.url, t.author.name, t.markdown_introduction) for t in topic.tutorials
+        ]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        written = list(pool.map(write, s.topics))
+
+    assert written[0] == written[1]
+    assert [author for _, author, _ in written[0]] == [
+        f"Author of {slug}" for slug in SLUGS
+    ]
+    assert written[0][0][2] == "Introduction to _tutorial-1_."
+    assert s.registry.created == len(SLUGS)
+    # The home page, 3 listing pages per topic and each article once
+    assert server.stats["requests"] == 1 + 2 * 3 + len(SLUGS)
+
+
+def test_loader_only_extracts_requested_fields(replay_server, make_summarizer):
+    server = replay_server({"basics": SLUGS[:3]})
+    s = make_summarizer(server)
+    records = list(s.build_index())
+    loader = TutorialLoader(s)
+
+    loaded = list(loader.load_all(records, fields=("author",)))
+    assert [r.url for r in loaded] == [r.url for r in records]
+    assert [r.author.name for r in loaded] == [f"Author of {s}" for s in SLUGS[:3]]
+    assert {(r.has_comments, r.comment_count) for r in loaded} == {(None, None)}
+    assert not any(r.is_hydrated for r in loaded)
+    # The home page, 2 listing pages and the articles, but no comment counts
+    assert server.stats["requests"] == 1 + 2 + 3
+
+    loaded = list(loader.load_all(records))
+    assert all(r.is_hydrated for r in loaded)
+    assert [r.comment_count for r in loaded] == [0, 1, 2]
+
+
+def test_selected_tutorials_are_counted_after_the_author_filter(
+    replay_server, make_summarizer, tmp_path, capsys
+):
+    server = replay_server({"basics": SLUGS})
+    s = make_summarizer(server, fields=())
+    args = Namespace(
+        tags=["basics"],
+        since=None,
+        until=None,
+        author="Author of tutorial-2",
+        fields=(),
+        queue_depth=4,
+    )
+    path = tmp_path / "selected.md"
+    write_selected(s, str(path), args)
+
+    assert path.read_text().count("## [") == 1
+    assert "Found 1 matching tutorials out of 5" in capsys.readouterr().out
+
+
+def test_incremental_crawl_stops_at_known_cards(
+    replay_server, make_summarizer, tmp_path
+):
+    store_path = str(tmp_path / "store.sqlite")
+    server = replay_server({"basics": SLUGS}, cards_per_page=2)
+    s = make_summarizer(server, store_path=store_path, fields=())
+    (topic,) = s.topics
+    assert [card.title for card in topic.cards] == [f"About {slug}" for slug in SLUGS]
+    s.store.close()
+
+    # A new tutorial pushes every other card one place down the listing
+    slugs = ["tutorial-0"] + SLUGS
+    server = replay_server({"basics": slugs}, cards_per_page=2)
+    summarizer.soup_cache.clear()
+    s = make_summarizer(server, store_path=store_path, fields=(), incremental=True)
+    (topic,) = s.topics
+    titles = [card.title for card in topic.cards]
+
+    # Page 2 only lists known cards, so the older ones are merged from the store
+    assert titles == [f"About {slug}" for slug in slugs]
+    assert server.stats["requests"] == 2
+    assert [card.title for card in s.store.get_cards("basics")] == titles
+    s.store.close()
+
+
+def test_pages_after_the_nav_are_walked_until_one_is_missing(
+    replay_server, make_summarizer
+):
+    # Every page is full, and the nav only links to the first two
+    slugs = SLUGS + ["tutorial-6"]
+    server = replay_server({"basics": slugs}, cards_per_page=2, nav_pages=2)
+    s = make_summarizer(server, fields=())
+    (topic,) = s.topics
+    assert [card.title for card in topic.cards] == [f"About {slug}" for slug in slugs]
+    assert server.stats["404"] == 1  # Page 4
+
+
+def test_tutorials_listed_under_several_topics_are_shared(
+    replay_server, make_summarizer
+):
+    server = replay_server({"advanced": SLUGS[:3], "basics": SLUGS[1:4]})
+    s = make_summarizer(server, fields=())
+    advanced, basics = ({t.url: t for t in topic.tutorials} for topic in s.topics)
+
+    shared = set(advanced) & set(basics)
+    assert len(shared) == 2
+    assert all(advanced[url] is basics[url] for url in shared)
+    assert {basics[url].topic.name for url in shared} == {"advanced"}
+    assert (s.registry.created, s.registry.reused, len(s.registry)) == (4, 2, 4)
+    assert all(url in s.registry for url in shared)
+
+    # Threads getting the same card at once get the same tutorial
+    topic, *_ = s.topics
+    card = next(iter(topic.cards))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        tutorials = list(pool.map(lambda _: s.registry.get(card, topic), range(32)))
+    assert len({id(tutorial) for tutorial in tutorials}) == 1
+    assert s.registry.created == 4
+
+
+def test_articles_extracted_in_processes_match(replay_server, make_summarizer):
+    server = replay_server({"basics": SLUGS[:3] + ["course-1"]}, premium=("course-1",))
+
+    def records(**kwargs):
+        s = make_summarizer(server, include_premium=True, **kwargs)
+        (topic,) = s.topics
+        return [tutorial.record for tutorial in topic.tutorials], s.metrics
+
+    in_process, _ = records(fields=ARTICLE_FIELDS)
+    summarizer.soup_cache.clear()
+    in_pool, metrics = records(fields=ARTICLE_FIELDS, processes=2)
+    assert in_pool == in_process
+    timers = metrics.as_dict()["total"]["timers"]
+    assert timers["extract_article"]["count"] == 4
+    assert in_pool[0].author.name == "Author of tutorial-1"
+    assert in_pool[-1].behind_paywall
+    assert in_pool[-1].markdown_introduction == PAYWALL_INTRODUCTION
@@ -0,0 +1,87 @@
+import json
+
+from collections import namedtuple
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+# Local imports
+from disqus import CommentCounts, extract_comment_counts, generate_count_query_url
+from exceptions import CommentCountError
+
+FakeResponse = namedtuple("FakeResponse", "text")
+
+
+def count_response(counts) -> FakeResponse:
+    data = {"text": {}, "counts": [{"id": i, "comments": n} for i, n in counts]}
+    return FakeResponse(
+        f"var DISQUSWIDGETS;DISQUSWIDGETS.displayCount({json.dumps(data)});"
+    )
+
+
+class FakeDisqus:
+    """Answers count queries from `counts`, and records the queried ids."""
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.queries = []
+
+    def get_response(self, url):
+        identifiers = parse_qs(urlsplit(url).query)["1"]
+        self.queries.append(identifiers)
+        return count_response((i, self.counts[i]) for i in identifiers)
+
+
+def test_generate_count_query_url_quotes_identifiers():
+    url = generate_count_query_url("https://realpython.com/a/", "b c")
+    query = urlsplit(url).query
+    assert query == "1=https%3A%2F%2Frealpython.com%2Fa%2F&1=b%20c"
+    assert parse_qs(query)["1"] == ["https://realpython.com/a/", "b c"]
+
+
+def test_extract_comment_counts():
+    response = count_response([("a", 3), ("b", "12")])
+    assert extract_comment_counts(response) == {"a": 3, "b": 12}
+
+
+@pytest.mark.parametrize(
+    "text", ["", "displayCount(not json)", 'displayCount({"counts": [{"id": "a"}]})']
+)
+def test_extract_comment_counts_invalid(text):
+    with pytest.raises(CommentCountError):
+        extract_comment_counts(FakeResponse(text))
+
+
+def test_requested_counts_are_queried_in_batches():
+    disqus = FakeDisqus({str(i): i for i in range(5)})
+    counts = CommentCounts(disqus.get_response, batch_size=2)
+    for identifier in ["0", "1", "2", "1", "3", "4"]:
+        counts.request(identifier)
+    assert disqus.queries == []
+
+    counts.flush()
+    assert disqus.queries == [["0", "1"], ["2", "3"], ["4"]]
+    assert [counts.get(str(i)) for i in range(5)] == [0, 1, 2, 3, 4]
+    assert counts.queries == 3
+
+
+def test_known_counts_are_not_queried_again():
+    disqus = FakeDisqus({"a": 1, "b": 2})
+    counts = CommentCounts(disqus.get_response)
+    assert counts.get("a") == 1  # Not requested, so queried on its own
+    counts.request("a")
+    counts.request("b")
+    counts.flush()
+    assert disqus.queries == [["a"], ["b"]]
+    assert len(counts) == 2
+
+
+def test_missing_identifier_raises():
+    def get_response(url):
+        return count_response([("a", 1)])
+
+    counts = CommentCounts(get_response)
+    counts.request("a")
+    counts.request("b")
+    with pytest.raises(CommentCountError):
+        counts.flush()
@@ -0,0 +1,68 @@
+import csv
+import json
+import os
+
+import pytest
+
+# Local imports
+from export import EXPORT_COLUMNS, UMASK, CsvWriter, JsonLinesWriter, RowWriter
+
+ROW = dict.fromkeys(EXPORT_COLUMNS)
+ROW.update(
+    title="Pythons Zen – Übersicht 🐍",
+    url="https://realpython.com/zen/",
+    tags=["basics", "best-practices"],
+    author="Łukasz Langa",
+)
+
+
+def test_row_writer_is_abstract():
+    with pytest.raises(TypeError):
+        RowWriter("rows.txt")
+
+
+def test_json_lines_writer_writes_utf8(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    writer = JsonLinesWriter(str(path))
+    writer.write(ROW)
+    writer.write(dict(ROW, title="Second"))
+    writer.close()
+
+    text = path.read_text(encoding="utf-8")
+    assert "Übersicht 🐍" in text  # Not escaped
+    rows = [json.loads(line) for line in text.splitlines()]
+    assert rows == [ROW, dict(ROW, title="Second")]
+    assert writer.rows == 2
+
+
+def test_csv_writer_writes_utf8(tmp_path):
+    path = tmp_path / "rows.csv"
+    writer = CsvWriter(str(path))
+    writer.write(ROW)
+    writer.close()
+
+    with open(path, encoding="utf-8", newline="") as file:
+        (row,) = csv.DictReader(file)
+    assert list(row) == list(EXPORT_COLUMNS)
+    assert row["title"] == ROW["title"]
+    assert row["author"] == ROW["author"]
+    assert row["tags"] == "basics;best-practices"
+    assert row["comment_count"] == ""
+
+
+def test_incomplete_file_is_removed(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    path.write_text("previous rows\n")
+    writer = JsonLinesWriter(str(path))
+    writer.write(ROW)
+    writer.close(complete=False)
+
+    assert path.read_text() == "previous rows\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["rows.jsonl"]
+
+
+def test_files_get_default_permissions(tmp_path):
+    path = tmp_path / "rows.csv"
+    writer = CsvWriter(str(path))
+    writer.close()
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~UMASK
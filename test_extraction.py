@@ -0,0 +1,116 @@
+import os
+
+from datetime import datetime
+
+import pytest
+
+# Local imports
+from records import Author, Card, Tag
+from summarizer import (
+    PAYWALL_INTRODUCTION,
+    build_card_from_element,
+    convert_introduction,
+    extract_article,
+    find_author,
+    find_comments,
+    get_article_body,
+    get_metadata_element,
+    is_behind_paywall,
+    parse_html,
+)
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), "test_pages")
+BASE_URL = "https://realpython.com"
+ARTICLE_URL = BASE_URL + "/python-f-strings/"
+COURSE_URL = BASE_URL + "/courses/python-dictionaries/"
+
+
+def read_page(name: str) -> bytes:
+    with open(os.path.join(PAGES_DIR, name), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def article():
+    return parse_html(read_page("article.html"))
+
+
+@pytest.fixture(scope="module")
+def premium():
+    return parse_html(read_page("premium.html"))
+
+
+def test_build_card_from_element():
+    tree = parse_html(read_page("listing.html"))
+    cards = [
+        build_card_from_element(element, BASE_URL + "/tutorials/basics/")
+        for element in tree.xpath('//div[@class="card border-0"]')
+    ]
+    basics = Tag("basics", BASE_URL + "/tutorials/basics/")
+    assert cards == [
+        Card(
+            title="Python 3's f-Strings: An Improved String Formatting Syntax",
+            url=ARTICLE_URL,
+            is_premium=False,
+            date=datetime(2019, 7, 24),
+            tags=(basics, Tag("python", BASE_URL + "/tutorials/python/")),
+        ),
+        Card(
+            title="Dictionaries in Python",
+            url=COURSE_URL,
+            is_premium=True,
+            date=None,
+            tags=(basics,),
+        ),
+    ]
+
+
+def test_is_behind_paywall(article, premium):
+    assert not is_behind_paywall(article)
+    assert is_behind_paywall(premium)
+
+
+def test_find_author(article, premium):
+    author = find_author(get_metadata_element(article), ARTICLE_URL)
+    assert author == Author("Joanna Jablonski", ARTICLE_URL + "#author")
+    assert find_author(get_metadata_element(premium), COURSE_URL) is None
+
+
+def test_find_comments(article, premium):
+    comments = find_comments(get_metadata_element(article), ARTICLE_URL)
+    assert comments == (ARTICLE_URL, ARTICLE_URL + "#reader-comments")
+    assert find_comments(get_metadata_element(premium), COURSE_URL) is None
+
+
+def test_convert_introduction(article, premium):
+    introduction = convert_introduction(get_article_body(article), is_course=False)
+    # Up to the first div after the introduction
+    assert introduction.split("\n\n") == [
+        "As of Python 3.6, f-strings are a great __new way__ to format strings.",
+        "By the end of this article, you will learn [why](#why) to use them.",
+    ]
+
+    introduction = convert_introduction(get_article_body(premium), is_course=True)
+    assert introduction.split("\n\n") == [
+        "In this course, you'll learn how to work with _dictionaries_.",
+        "Dictionaries are Python's implementation of a hash table.",
+    ]
+
+
+def test_extract_article(article):
+    fields = extract_article(ARTICLE_URL, read_page("article.html"), False)
+    assert not fields.behind_paywall
+    assert fields.author == find_author(get_metadata_element(article), ARTICLE_URL)
+    assert fields.has_comments
+    assert (fields.disqus_identifier, fields.comments_url) == find_comments(
+        get_metadata_element(article), ARTICLE_URL
+    )
+    assert fields.markdown_introduction == convert_introduction(
+        get_article_body(article), is_course=False
+    )
+
+    fields = extract_article(COURSE_URL, read_page("premium.html"), True)
+    assert fields.behind_paywall
+    assert fields.author is None
+    assert fields.has_comments is False
+    assert fields.markdown_introduction == PAYWALL_INTRODUCTION
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from requests_cache import CachedSession, SQLiteCache
+
+# Local imports
+from httpcache import (
+    ZLIB_HEADER,
+    BoundedSQLiteCache,
+    compressed_serializer,
+    decompress,
+)
+
+SLUGS = [f"tutorial-{i}" for i in range(1, 5)]
+
+
+@pytest.fixture
+def server(replay_server):
+    return replay_server({"basics": SLUGS})
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "http_cache.sqlite")
+
+
+def get(backend, url):
+    return CachedSession(backend=backend).get(url)
+
+
+def stored_values(cache):
+    with cache.responses.connection() as con:
+        return dict(con.execute("SELECT key, value FROM responses"))
+
+
+def test_responses_are_stored_compressed(server, db_path):
+    cache = BoundedSQLiteCache(db_path)
+    response = get(cache, server.base_url + "/tutorial-1/")
+
+    (value,) = stored_values(cache).values()
+    assert value[:1] == ZLIB_HEADER
+    assert cache.size == len(value)
+    cached = compressed_serializer.loads(value)
+    assert cached.content == response.content
+    assert decompress(b"not compressed") == b"not compressed"
+
+
+def test_uncompressed_responses_are_loaded_and_compacted(server, db_path):
+    url = server.base_url + "/tutorial-1/"
+    response = get(SQLiteCache(db_path), url)  # Stored uncompressed
+    server.reset_stats()
+
+    cache = BoundedSQLiteCache(db_path)
+    cached = get(cache, url)
+    assert cached.from_cache and cached.content == response.content
+    assert server.stats["requests"] == 0
+    assert cache.report()["compressed"] == 0
+
+    assert cache.compact() == dict(uncacheable=0, compressed=1, evicted=0)
+    (value,) = stored_values(cache).values()
+    assert value[:1] == ZLIB_HEADER and cache.size == len(value)
+    assert get(cache, url).content == response.content
+
+
+def test_least_recently_used_responses_are_evicted(server, db_path):
+    cache = BoundedSQLiteCache(db_path)
+    urls = [server.base_url + f"/{slug}/" for slug in SLUGS]
+    for url in urls[:3]:
+        get(cache, url)
+        time.sleep(0.01)
+    get(cache, urls[0])  # Now used more recently than the other two
+    time.sleep(0.01)
+
+    cache.max_size = cache.size  # The next response takes the cache over
+    get(cache, urls[3])
+
+    assert cache.size <= 0.9 * cache.max_size
+    assert cache.size == sum(map(len, stored_values(cache).values()))
+    session = CachedSession(backend=cache)
+    cached = [session.get(url, only_if_cached=True).status_code == 200 for url in urls]
+    assert cached == [True, False, False, True]
+    assert cache.evictions == 2
+
+
+def test_report_compact_and_vacuum(server, db_path):
+    cache = BoundedSQLiteCache(db_path)
+    for slug in SLUGS:
+        get(cache, server.base_url + f"/{slug}/")
+
+    report = cache.report()
+    assert report["entries"] == report["compressed"] == len(SLUGS)
+    assert report["stored_bytes"] == cache.size
+    assert report["oldest_use"] is not None and report["newest_use"] is not None
+
+    # Every response was used more than an hour ago
+    with cache.responses.connection(commit=True) as con:
+        con.execute("UPDATE access SET last_used = last_used - 7200")
+    assert cache.compact(max_age=3600) == dict(
+        uncacheable=0, compressed=0, evicted=len(SLUGS)
+    )
+    cache.vacuum()
+    report = cache.report()
+    assert report["entries"] == report["stored_bytes"] == 0
+    assert report["oldest_use"] is None
+    cache.close()
@@ -0,0 +1,91 @@
+from datetime import datetime
+
+# Local imports
+from journal import CrawlJournal
+from records import Author, Tag, TutorialRecord
+
+OPTIONS = {"include_premium": False, "fields": ["author", "introduction"]}
+
+RECORD = TutorialRecord(
+    url="https://realpython.com/a/",
+    fingerprint="f" * 40,
+    title="A",
+    is_premium=False,
+    date=datetime(2019, 5, 1),
+    tags=(Tag("basics", "https://realpython.com/tutorials/basics/"),),
+    behind_paywall=False,
+    author=Author("Someone", "https://realpython.com/team/someone/"),
+    has_comments=False,
+    disqus_identifier=None,
+    comments_url=None,
+    comment_count=None,
+    markdown_introduction="Introduction",
+)
+
+
+def record_progress(path, topic_path):
+    journal = CrawlJournal(path, OPTIONS)
+    journal.put_topic("basics", topic_path)
+    journal.put_page("https://realpython.com/tutorials/basics/")
+    journal.put_page("https://realpython.com/tutorials/basics/")  # Recorded once
+    journal.put_tutorial(RECORD)
+    journal.close()
+
+
+def test_resume_with_same_options(tmp_path):
+    path = str(tmp_path / "journal.sqlite")
+    topic_path = tmp_path / "basics.md"
+    topic_path.write_text("# Basics\n")
+    record_progress(path, str(topic_path))
+
+    journal = CrawlJournal(path, dict(OPTIONS), resume=True)
+    assert journal.resumed
+    assert journal.resumable_tutorials == 1
+    assert journal.is_topic_done("basics", str(topic_path))
+    assert not journal.is_topic_done("basics", str(tmp_path / "other.md"))
+    assert journal.has_page("https://realpython.com/tutorials/basics/")
+    assert journal.get_tutorial(RECORD.url) == RECORD
+    assert journal.get_tutorial("https://realpython.com/b/") is None
+    assert journal.reused_tutorials == 1
+    journal.close()
+
+
+def test_topic_is_not_done_without_its_file(tmp_path):
+    path = str(tmp_path / "journal.sqlite")
+    topic_path = tmp_path / "basics.md"
+    record_progress(path, str(topic_path))
+
+    journal = CrawlJournal(path, OPTIONS, resume=True)
+    assert journal.resumed
+    assert not journal.is_topic_done("basics", str(topic_path))
+    journal.close()
+
+
+def test_different_options_or_no_resume_clear_the_journal(tmp_path):
+    path = str(tmp_path / "journal.sqlite")
+    record_progress(path, str(tmp_path / "basics.md"))
+    journal = CrawlJournal(path, dict(OPTIONS, include_premium=True), resume=True)
+    assert not journal.resumed
+    assert journal.resumable_tutorials == 0
+    assert journal.get_tutorial(RECORD.url) is None
+    journal.close()
+
+    record_progress(path, str(tmp_path / "basics.md"))
+    journal = CrawlJournal(path, OPTIONS)
+    assert not journal.resumed
+    assert not journal.has_page("https://realpython.com/tutorials/basics/")
+    journal.close()
+
+
+def test_finish_clears_the_journal(tmp_path):
+    path = str(tmp_path / "journal.sqlite")
+    record_progress(path, str(tmp_path / "basics.md"))
+    journal = CrawlJournal(path, OPTIONS, resume=True)
+    journal.finish()
+    assert not journal.has_page("https://realpython.com/tutorials/basics/")
+    assert journal.get_tutorial(RECORD.url) is None
+    journal.close()
+
+    journal = CrawlJournal(path, OPTIONS, resume=True)
+    assert not journal.resumed
+    journal.close()
@@ -0,0 +1,86 @@
+import json
+import threading
+
+import pytest
+
+# Local imports
+from metrics import Metrics, percentile
+
+
+def test_counters_and_timers_are_totalled_by_topic():
+    metrics = Metrics()
+    metrics.count("pages", "basics")
+    metrics.count("pages", "basics", 2)
+    metrics.count("pages", "docker")
+    metrics.count("comment_queries")  # Shared by every topic
+    metrics.add_time("parse", 0.5, "basics")
+    metrics.add_time("parse", 1.5, "docker")
+
+    data = metrics.as_dict()
+    assert data["total"]["counters"] == {"comment_queries": 1, "pages": 4}
+    assert data["topics"]["basics"]["counters"] == {"pages": 3}
+    assert data["topics"]["docker"]["timers"] == {"parse": {"count": 1, "seconds": 1.5}}
+    assert data["total"]["timers"]["parse"] == {
+        "count": 2,
+        "seconds": 2.0,
+        "p50": 1.5,
+        "p90": 1.5,
+        "p99": 1.5,
+        "max": 1.5,
+    }
+    assert None not in data["topics"]
+
+
+def test_timer_records_failed_stages():
+    metrics = Metrics()
+    with pytest.raises(ValueError):
+        with metrics.timer("network", "basics"):
+            raise ValueError
+    with metrics.timer("network", "basics"):
+        pass
+    timer = metrics.as_dict()["topics"]["basics"]["timers"]["network"]
+    assert timer["count"] == 2
+
+
+def test_counts_from_many_threads():
+    metrics = Metrics()
+
+    def work():
+        for _ in range(1000):
+            metrics.count("requests", "basics")
+            metrics.add_time("network", 0.001, "basics")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = metrics.as_dict()["total"]
+    assert total["counters"]["requests"] == 8000
+    assert total["timers"]["network"]["count"] == 8000
+
+
+def test_percentiles():
+    assert percentile([], 50) is None
+    values = list(range(100, 0, -1))  # Not sorted
+    assert [percentile(values, p) for p in (50, 90, 99, 100)] == [51, 91, 100, 100]
+
+    metrics = Metrics()
+    assert metrics.percentiles("parse") == dict.fromkeys(("p50", "p90", "p99", "max"))
+    for seconds in values:
+        metrics.add_time("parse", seconds / 1000)
+    assert metrics.percentiles("parse") == {
+        "p50": 0.051,
+        "p90": 0.091,
+        "p99": 0.1,
+        "max": 0.1,
+    }
+
+
+def test_dump(tmp_path):
+    metrics = Metrics()
+    metrics.count("pages", "basics")
+    path = str(tmp_path / "metrics.json")
+    metrics.dump(path)
+    with open(path) as f:
+        assert json.load(f) == metrics.as_dict()
@@ -0,0 +1,193 @@
+import os
+
+from datetime import datetime
+
+import pytest
+
+# Local imports
+from fetch import (
+    UMASK,
+    MarkdownDigest,
+    OutputManifest,
+    markdown_digest,
+    write_markdown,
+)
+from records import Author, Tag, TutorialRecord
+
+HEADING = "# basics tutorials and courses from Real Python"
+
+
+def record(slug, introduction="Introduction", tag_url="/tutorials/basics/"):
+    return TutorialRecord(
+        url=f"https://realpython.com/{slug}/",
+        fingerprint=None,
+        title=f"About {slug}",
+        is_premium=False,
+        date=datetime(2019, 5, 1),
+        tags=(Tag("basics", tag_url),),
+        behind_paywall=False,
+        author=Author("Someone", "https://realpython.com/team/someone/"),
+        has_comments=True,
+        disqus_identifier=f"https://realpython.com/{slug}/",
+        comments_url=f"https://realpython.com/{slug}/#reply",
+        comment_count=3,
+        markdown_introduction=introduction,
+    )
+
+
+TUTORIALS = [record("a"), record("b")]
+
+
+def test_digest_depends_on_written_values():
+    digest = markdown_digest(HEADING, TUTORIALS)
+    assert digest == markdown_digest(HEADING, list(TUTORIALS))
+    assert digest != markdown_digest(HEADING, TUTORIALS[:1])
+    assert digest != markdown_digest(HEADING, TUTORIALS[::-1])
+    assert digest != markdown_digest("# Other heading", TUTORIALS)
+    assert digest != markdown_digest(HEADING, TUTORIALS, fields=("author",))
+    assert digest != markdown_digest(HEADING, [TUTORIALS[0], record("b", "New")])
+    # Tag urls are written, even though they are not exported
+    assert digest != markdown_digest(
+        HEADING, [TUTORIALS[0], record("b", tag_url="/tutorials/other/")]
+    )
+
+    streamed = MarkdownDigest(HEADING)
+    for tutorial in TUTORIALS:
+        streamed.update(tutorial)
+    assert streamed.hexdigest() == digest
+
+
+def test_manifest_round_trip(tmp_path):
+    manifest_path = str(tmp_path / "manifest.json")
+    path = str(tmp_path / "basics.md")
+    manifest = OutputManifest(manifest_path)
+    assert not manifest.may_be_current(path)  # The file does not exist
+    manifest.update(path, "digest")
+    manifest.update(str(tmp_path / "docker.md"), "other digest", changed=False)
+    assert manifest.changed == [path]
+    assert manifest.unchanged == [str(tmp_path / "docker.md")]
+    manifest.save()
+
+    with open(manifest_path) as f:
+        saved = f.read()
+    manifest = OutputManifest(manifest_path)
+    open(path, "w").close()
+    assert manifest.may_be_current(path)
+    assert not OutputManifest(manifest_path, force=True).may_be_current(path)
+    manifest.update(path, "digest", changed=False)
+    os.utime(manifest_path, (0, 0))
+    manifest.save()  # Nothing changed, so the manifest is not written
+    assert os.path.getmtime(manifest_path) == 0
+    with open(manifest_path) as f:
+        assert f.read() == saved
+
+
+def rendered(tmp_path, tutorials) -> str:
+    """Return the markdown written without a manifest."""
+    path = str(tmp_path / "expected.md")
+    assert write_markdown(path, HEADING, iter(tutorials), 2)
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    os.remove(path)
+    return content
+
+
+def test_unchanged_file_is_not_replaced(tmp_path):
+    path = str(tmp_path / "basics.md")
+    manifest = OutputManifest(str(tmp_path / "manifest.json"))
+    assert write_markdown(path, HEADING, iter(TUTORIALS), 2, manifest=manifest)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == rendered(tmp_path, TUTORIALS)
+    os.utime(path, (0, 0))
+
+    assert not write_markdown(path, HEADING, iter(TUTORIALS), 2, manifest=manifest)
+    assert os.path.getmtime(path) == 0
+    assert manifest.changed == [path]
+    assert manifest.unchanged == [path]
+    assert sorted(os.listdir(tmp_path)) == ["basics.md"]  # No temporary files
+
+    forced = OutputManifest(str(tmp_path / "manifest.json"), force=True)
+    assert write_markdown(path, HEADING, iter(TUTORIALS), 2, manifest=forced)
+    assert os.path.getmtime(path) != 0
+
+
+def test_changed_file_is_replaced(tmp_path):
+    path = str(tmp_path / "basics.md")
+    manifest = OutputManifest(str(tmp_path / "manifest.json"))
+    assert write_markdown(path, HEADING, iter(TUTORIALS), 2, manifest=manifest)
+
+    # Changed at the end, shorter, and longer than the existing file
+    changes = [
+        [TUTORIALS[0], record("b", "New introduction")],
+        TUTORIALS[:1],
+        TUTORIALS + [record("c")],
+        [record("c")] + TUTORIALS,
+    ]
+    for tutorials in changes:
+        assert write_markdown(path, HEADING, iter(tutorials), 2, manifest=manifest)
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == rendered(tmp_path, tutorials)
+    assert manifest.unchanged == []
+    assert sorted(os.listdir(tmp_path)) == ["basics.md"]  # No temporary files
+
+
+def test_files_get_default_permissions(tmp_path):
+    # Not only readable by their owner, as temporary files are
+    path = str(tmp_path / "basics.md")
+    write_markdown(path, HEADING, iter(TUTORIALS), 2)
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~UMASK
+
+
+class FullDisk:
+    """Metrics whose write timer fails, like writing to a full disk."""
+
+    def timer(self, stage, topic=None):
+        raise OSError(28, "No space left on device")
+
+    def count(self, name, topic=None, n=1):
+        pass
+
+
+def test_file_is_replaced_atomically(tmp_path, monkeypatch):
+    path = str(tmp_path / "basics.md")
+    replaced = []
+
+    def replace(src, dst):
+        replaced.append((os.path.dirname(src), dst))
+        os_replace(src, dst)
+
+    os_replace = os.replace
+    monkeypatch.setattr(os, "replace", replace)
+    assert write_markdown(path, HEADING, iter(TUTORIALS), 2)
+    # From a temporary file in the same directory, so on the same file system
+    assert replaced == [(str(tmp_path), path)]
+
+
+def test_interrupted_write_keeps_the_existing_file(tmp_path):
+    path = str(tmp_path / "basics.md")
+    write_markdown(path, HEADING, iter(TUTORIALS), 2)
+    with open(path, encoding="utf-8") as f:
+        existing = f.read()
+
+    def failing_tutorials():
+        yield record("c")
+        raise RuntimeError("extraction failed")
+
+    with pytest.raises(RuntimeError):
+        write_markdown(path, HEADING, failing_tutorials(), 2)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == existing
+    assert sorted(os.listdir(tmp_path)) == ["basics.md"]  # No temporary files
+
+
+def test_writer_errors_reach_the_caller(tmp_path):
+    path = str(tmp_path / "basics.md")
+    write_markdown(path, HEADING, iter(TUTORIALS), 2)
+    with open(path, encoding="utf-8") as f:
+        existing = f.read()
+
+    with pytest.raises(OSError):
+        write_markdown(path, HEADING, iter(TUTORIALS * 10), 1, metrics=FullDisk())
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == existing
+    assert sorted(os.listdir(tmp_path)) == ["basics.md"]
@@ -0,0 +1,41 @@
+import pytest
+
+# Local imports
+from summarizer import count_pages, has_multiple_pages, parse_html
+
+
+def listing(nav: str) -> bytes:
+    return f"<html><body><div>Cards</div>{nav}</body></html>".encode()
+
+
+@pytest.mark.parametrize(
+    "nav, pages",
+    [
+        # Links to numbered pages
+        (
+            '<nav aria-label="Page Navigation">'
+            '<a href="/tutorials/basics/page/2/">2</a>'
+            '<a href="/tutorials/basics/page/7/">7</a>'
+            '<a href="/tutorials/basics/page/2/">Next</a></nav>',
+            7,
+        ),
+        # Link texts, when the hrefs are not numbered
+        (
+            '<nav aria-label="Page Navigation">'
+            '<a href="?p=2"> 2 </a><a href="?p=3">3</a><a href="?p=2">Next</a></nav>',
+            3,
+        ),
+        # No numbered links at all
+        ('<nav aria-label="Page Navigation"><a href="?next">Next</a></nav>', None),
+    ],
+)
+def test_count_pages(nav, pages):
+    tree = parse_html(listing(nav))
+    assert has_multiple_pages(tree)
+    assert count_pages(tree) == pages
+
+
+def test_single_page():
+    tree = parse_html(listing('<nav aria-label="Menu"><a href="/page/4/">4</a></nav>'))
+    assert not has_multiple_pages(tree)
+    assert count_pages(tree) is None
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Local imports
+from summarizer import prefetch
+
+
+def test_results_are_yielded_in_order_with_a_bounded_window():
+    in_flight = []
+    max_in_flight = []
+    lock = threading.Lock()
+
+    def fetch(i):
+        with lock:
+            in_flight.append(i)
+            max_in_flight.append(len(in_flight))
+        time.sleep(0.01 * (5 - i % 5))  # Later items finish first
+        with lock:
+            in_flight.remove(i)
+        return i * i
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(prefetch(range(20), fetch, executor, window=4))
+    assert results == [i * i for i in range(20)]
+    assert max(max_in_flight) <= 4
+
+
+def test_items_are_only_fetched_ahead_of_the_consumer_by_the_window():
+    fetched = []
+
+    def fetch(i):
+        fetched.append(i)
+        return i
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = prefetch(iter(range(10)), fetch, executor, window=3)
+        assert next(results) == 0
+        time.sleep(0.05)
+        assert sorted(fetched) == [0, 1, 2]
+
+
+def test_errors_are_raised_in_order():
+    def fetch(i):
+        if i == 2:
+            raise ValueError(i)
+        return i
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = prefetch(range(5), fetch, executor, window=2)
+        assert [next(results), next(results)] == [0, 1]
+        with pytest.raises(ValueError):
+            next(results)
@@ -0,0 +1,99 @@
+import random
+import time
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+# Local imports
+from ratelimit import TokenBucket, backoff_delay, parse_retry_after
+
+
+def test_acquire_consumes_capacity_without_waiting():
+    bucket = TokenBucket(rate=1.0, capacity=3)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.5
+
+
+def test_acquire_waits_for_tokens_to_accrue():
+    bucket = TokenBucket(rate=20.0, capacity=1)
+    bucket.acquire()
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.04  # About 1/20 s
+
+
+def test_try_acquire_does_not_wait():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    bucket = TokenBucket(rate=100.0, capacity=5)
+    bucket.throttle(retry_after=10)
+    assert not bucket.try_acquire()
+
+
+def test_throttle_halves_rate_once_per_episode():
+    bucket = TokenBucket(rate=4.0, capacity=4, min_rate=0.5)
+    bucket.throttle(retry_after=0.2)
+    bucket.throttle(retry_after=0.2)  # Same episode (e.g. another worker)
+    assert bucket.rate == 2.0
+    assert bucket.throttled == 1
+
+    time.sleep(0.25)
+    bucket.throttle(retry_after=0.01)
+    assert bucket.rate == 1.0
+    assert bucket.throttled == 2
+
+
+def test_throttle_does_not_go_below_min_rate():
+    bucket = TokenBucket(rate=1.0, capacity=1, min_rate=0.8)
+    bucket.throttle(retry_after=0)
+    assert bucket.rate == 0.8
+
+
+def test_throttle_blocks_until_retry_after():
+    bucket = TokenBucket(rate=100.0, capacity=5)
+    bucket.throttle(retry_after=0.2)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_reward_raises_rate_up_to_max_rate():
+    bucket = TokenBucket(rate=1.0, capacity=1, max_rate=1.1, increase=0.06)
+    bucket.reward()
+    assert bucket.rate == 1.06
+    bucket.reward()
+    assert bucket.rate == 1.1
+
+
+def test_backoff_delay_grows_exponentially_up_to_cap():
+    random.seed(0)
+    for attempt, bound in [(1, 0.5), (2, 1.0), (3, 2.0), (10, 30.0)]:
+        delays = [backoff_delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= bound for delay in delays)
+        assert max(delays) > 0.8 * bound  # Jitter spans the whole range
+    assert backoff_delay(20, base=1.0, cap=0.0) == 0.0
+
+
+def test_parse_retry_after_seconds():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(" 1.5 ") == 1.5
+    assert parse_retry_after("-3") == 0.0
+
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=60)
+    seconds = parse_retry_after(format_datetime(when, usegmt=True))
+    assert 55 <= seconds <= 60
+
+    past = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+
+def test_parse_retry_after_invalid():
+    assert parse_retry_after("") is None
+    assert parse_retry_after("soon") is None
@@ -0,0 +1,39 @@
+import pickle
+
+from datetime import datetime
+
+import pytest
+
+# Local imports
+from records import Author, Card, Comments, Tag, TutorialRecord, card_record
+
+TAGS = (Tag("basics", "https://realpython.com/tutorials/basics/"),)
+CARD = Card("A", "/a/", False, datetime(2019, 5, 1), TAGS)
+
+
+def test_records_have_no_instance_dict():
+    record = card_record(CARD, "https://realpython.com/a/")
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_records_pickle_round_trip(protocol):
+    record = card_record(CARD, "https://realpython.com/a/")
+    hydrated = record._replace(
+        behind_paywall=False,
+        author=Author("Someone", "https://realpython.com/team/someone/"),
+        has_comments=True,
+        disqus_identifier="https://realpython.com/a/",
+        comments_url="https://realpython.com/a/#reply",
+        comment_count=3,
+        markdown_introduction="Introduction",
+    )
+    for original in (record, hydrated):
+        copy = pickle.loads(pickle.dumps(original, protocol))
+        assert copy == original
+        assert type(copy) is TutorialRecord
+        assert copy.is_hydrated == original.is_hydrated
+    assert copy.comments == Comments(3, "https://realpython.com/a/#reply")
+    assert copy.tag_names == ("basics",)
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+# Local imports
+from exceptions import UnsuccessfulGet
+
+
+@pytest.fixture
+def server(replay_server):
+    return replay_server({"basics": ["tutorial-1"]})
+
+
+def test_throttled_requests_are_retried_a_limited_number_of_times(
+    server, make_summarizer
+):
+    s = make_summarizer(server, retries=2)
+    server.throttle = 1.0  # Every page but the home page is answered with 429
+
+    with pytest.raises(UnsuccessfulGet):
+        s.get_response(server.base_url + "/tutorial-1/")
+    assert server.stats["429"] == 3
+    assert s.metrics.as_dict()["total"]["counters"]["throttled"] == 3
+
+
+def test_throttled_requests_are_not_retried_after_the_deadline(server, make_summarizer):
+    s = make_summarizer(server, deadline=1.0)
+    server.throttle = 1.0
+    server.retry_after = 5
+
+    start = time.monotonic()
+    with pytest.raises(UnsuccessfulGet):
+        s.get_response(server.base_url + "/tutorial-1/")
+    assert time.monotonic() - start < 1.0
+    assert server.stats["429"] == 1
+
+
+def test_deadline_starts_once_the_rate_limit_lets_the_request_through(
+    server, make_summarizer
+):
+    s = make_summarizer(server, deadline=0.5)
+    s.rate_limiter.throttle(1.0)  # No request is let through for a second
+
+    response = s.get_response(server.base_url + "/tutorial-1/")
+    assert response.status_code == 200
@@ -0,0 +1,99 @@
+import threading
+import time
+
+# Local imports
+from records import Card, Tag, card_record
+from shard import WorkQueue
+
+OPTIONS = {"include_premium": False, "fields": ["author", "introduction"]}
+
+
+def records(*slugs):
+    tags = (Tag("basics", "/tutorials/basics/"),)
+    return [
+        card_record(Card(slug, f"/{slug}/", False, None, tags), f"/{slug}/")
+        for slug in slugs
+    ]
+
+
+def plan(path, chunk_size=2, options=OPTIONS):
+    queue = WorkQueue(path)
+    # "c" is listed under both topics, but only extracted once
+    topics = [
+        ("basics", "/tutorials/basics/", records("a", "b", "c")),
+        ("docker", "/tutorials/docker/", records("c", "d", "e")),
+    ]
+    assert queue.plan(options, topics, chunk_size=chunk_size) == 5
+    return queue
+
+
+def test_tasks_are_claimed_once(tmp_path):
+    queue = plan(str(tmp_path / "queue.sqlite"))
+    assert queue.topics() == [
+        ("basics", "/tutorials/basics/"),
+        ("docker", "/tutorials/docker/"),
+    ]
+    claims = [queue.claim("worker 1"), queue.claim("worker 2"), queue.claim("worker 1")]
+    assert [[r.url for r in task_records] for _, task_records in claims] == [
+        ["/a/", "/b/"],
+        ["/c/", "/d/"],
+        ["/e/"],
+    ]
+    assert queue.claim("worker 3") is None
+    assert queue.progress() == dict(tasks=3, done=0, claimed=3)
+    queue.close()
+
+
+def test_expired_leases_are_claimed_again(tmp_path):
+    queue = plan(str(tmp_path / "queue.sqlite"), chunk_size=5)
+    task_id, _ = queue.claim("worker 1")
+    assert queue.claim("worker 2", lease=60) is None
+    time.sleep(0.01)
+    assert queue.claim("worker 2", lease=0)[0] == task_id
+    queue.close()
+
+
+def test_completed_tasks_update_listings(tmp_path):
+    queue = plan(str(tmp_path / "queue.sqlite"))
+    while True:
+        claim = queue.claim("worker")
+        if claim is None:
+            break
+        task_id, task_records = claim
+        hydrated = [r._replace(markdown_introduction=r.title) for r in task_records]
+        queue.complete(task_id, hydrated)
+    assert queue.progress() == dict(tasks=3, done=3, claimed=0)
+
+    listing = queue.listing("docker")
+    assert [r.url for r in listing] == ["/c/", "/d/", "/e/"]
+    assert all(r.is_hydrated for r in listing)
+    queue.close()
+
+
+def test_no_tasks_without_article_fields(tmp_path):
+    queue = plan(str(tmp_path / "queue.sqlite"), options=dict(OPTIONS, fields=[]))
+    assert queue.claim("worker") is None
+    assert [r.url for r in queue.listing("basics")] == ["/a/", "/b/", "/c/"]
+    queue.close()
+
+
+def test_concurrent_workers_never_share_tasks(tmp_path):
+    path = str(tmp_path / "queue.sqlite")
+    plan(path, chunk_size=1).close()
+    claimed = []
+
+    def work(owner):
+        queue = WorkQueue(path)
+        while True:
+            claim = queue.claim(owner)
+            if claim is None:
+                break
+            claimed.append(claim[0])
+        queue.close()
+
+    threads = [threading.Thread(target=work, args=(str(i),)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == [1, 2, 3, 4, 5]
@@ -0,0 +1,49 @@
+# Local imports
+from soupcache import SOUP_BYTES_PER_HTML_BYTE, SoupCache
+
+
+def test_get_counts_hits_and_misses():
+    cache = SoupCache()
+    assert cache.get("a") is None
+    cache.put("a", "soup a", 10)
+    assert cache.get("a") == "soup a"
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.size == 10 * SOUP_BYTES_PER_HTML_BYTE
+
+
+def test_evicts_least_recently_used():
+    cache = SoupCache(max_size=2 * 10 * SOUP_BYTES_PER_HTML_BYTE)
+    cache.put("a", "soup a", 10)
+    cache.put("b", "soup b", 10)
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("c", "soup c", 10)
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.stats.evictions == 1
+
+
+def test_replacing_an_entry_updates_its_size():
+    cache = SoupCache()
+    cache.put("a", "soup a", 10)
+    cache.put("a", "new soup a", 5)
+    assert len(cache) == 1
+    assert cache.stats.size == 5 * SOUP_BYTES_PER_HTML_BYTE
+    assert cache.get("a") == "new soup a"
+
+
+def test_keeps_one_entry_larger_than_max_size():
+    cache = SoupCache(max_size=1)
+    cache.put("a", "soup a", 10)
+    cache.put("b", "soup b", 10)
+    assert len(cache) == 1
+    assert "b" in cache
+
+
+def test_resize_evicts():
+    cache = SoupCache()
+    for key in "abc":
+        cache.put(key, f"soup {key}", 10)
+    cache.resize(10 * SOUP_BYTES_PER_HTML_BYTE)
+    assert len(cache) == 1
+    assert "c" in cache
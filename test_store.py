@@ -0,0 +1,109 @@
+import multiprocessing
+import sqlite3
+
+from datetime import datetime
+
+# Local imports
+from records import Author, Card, Tag, TutorialRecord
+from store import STORE_VERSION, TutorialStore, fingerprint
+
+TAGS = (Tag("basics", "https://realpython.com/tutorials/basics/"),)
+
+RECORD = TutorialRecord(
+    url="https://realpython.com/a/",
+    fingerprint=fingerprint(b"<html>a</html>"),
+    title="A",
+    is_premium=False,
+    date=datetime(2019, 5, 1),
+    tags=TAGS,
+    behind_paywall=False,
+    author=Author("Someone", "https://realpython.com/team/someone/"),
+    has_comments=True,
+    disqus_identifier="https://realpython.com/a/",
+    comments_url="https://realpython.com/a/#reply",
+    comment_count=3,
+    markdown_introduction="Introduction",
+)
+
+
+def test_record_round_trip(tmp_path):
+    store = TutorialStore(str(tmp_path / "store.sqlite"))
+    store.put(RECORD)
+    assert store.get(RECORD.url, RECORD.fingerprint) == RECORD
+    assert len(store) == 1
+
+    partial = RECORD._replace(
+        url="https://realpython.com/b/", date=None, author=None, has_comments=False
+    )
+    store.put(partial)
+    assert store.get(partial.url, partial.fingerprint) == partial
+    store.close()
+
+
+def test_changed_page_is_a_miss(tmp_path):
+    store = TutorialStore(str(tmp_path / "store.sqlite"))
+    store.put(RECORD)
+    assert store.get(RECORD.url, fingerprint(b"<html>changed</html>")) is None
+    assert store.get("https://realpython.com/unknown/", RECORD.fingerprint) is None
+    assert store.get(RECORD.url, RECORD.fingerprint) is not None
+    assert (store.hits, store.misses) == (1, 2)
+    store.close()
+
+
+def test_cards_round_trip(tmp_path):
+    store = TutorialStore(str(tmp_path / "store.sqlite"))
+    cards = [
+        Card("A", "/a/", False, datetime(2019, 5, 1), TAGS),
+        Card("B", "/b/", True, None, ()),
+    ]
+    assert store.get_cards("basics") == []
+    store.put_cards("basics", cards)
+    assert store.get_cards("basics") == cards
+
+    store.put_cards("basics", cards[1:])  # Replaces the stored cards
+    assert store.get_cards("basics") == cards[1:]
+    assert store.get_cards("docker") == []
+    store.close()
+
+
+def test_records_persist_until_version_changes(tmp_path):
+    path = str(tmp_path / "store.sqlite")
+    store = TutorialStore(path)
+    store.put(RECORD)
+    store.close()
+
+    store = TutorialStore(path)
+    assert len(store) == 1
+    store.close()
+
+    connection = sqlite3.connect(path)
+    connection.execute(f"PRAGMA user_version={STORE_VERSION - 1}")
+    connection.close()
+    store = TutorialStore(path)
+    assert len(store) == 0
+    store.close()
+
+
+def open_store(path, barrier):
+    barrier.wait()
+    store = TutorialStore(path)
+    store.put(RECORD)
+    store.close()
+
+
+def test_processes_can_open_a_new_store_at_once(tmp_path):
+    path = str(tmp_path / "store.sqlite")
+    barrier = multiprocessing.Barrier(6)
+    processes = [
+        multiprocessing.Process(target=open_store, args=(path, barrier))
+        for _ in range(6)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * 6
+
+    store = TutorialStore(path)
+    assert store.get(RECORD.url, RECORD.fingerprint) == RECORD
+    store.close()
@@ -0,0 +1,49 @@
+import json
+import time
+
+# Local imports
+from summarizer import (
+    TOPICS_CACHE_FILE,
+    Summarizer,
+    load_available_topics,
+    save_available_topics,
+)
+
+BASE_URL = "https://realpython.com"
+TOPICS = {"basics": BASE_URL + "/tutorials/basics/"}
+
+
+def test_saved_topics_expire(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert load_available_topics(BASE_URL, max_age=60) is None  # Not saved yet
+
+    save_available_topics(BASE_URL, TOPICS)
+    assert load_available_topics(BASE_URL, max_age=60) == TOPICS
+    assert load_available_topics("http://127.0.0.1:8765", max_age=60) is None
+
+    with open(TOPICS_CACHE_FILE) as f:
+        saved = json.load(f)
+    saved["fetched_at"] = time.time() - 120
+    with open(TOPICS_CACHE_FILE, "w") as f:
+        json.dump(saved, f)
+    assert load_available_topics(BASE_URL, max_age=60) is None
+    assert load_available_topics(BASE_URL, max_age=600) == TOPICS
+
+    with open(TOPICS_CACHE_FILE, "w") as f:
+        f.write("{")  # E.g. written by an interrupted run
+    assert load_available_topics(BASE_URL, max_age=60) is None
+
+
+def test_topics_are_fetched_once_per_ttl(replay_server, make_summarizer, monkeypatch):
+    server = replay_server({"advanced": ["tutorial-1"], "basics": ["tutorial-2"]})
+    make_summarizer(server)
+    assert server.stats["requests"] == 1  # The home page
+
+    # A new process loads them from the saved file while they are fresh
+    monkeypatch.setattr(Summarizer, "_available_topics", None)
+    assert Summarizer.fetch_available_topics() == ["advanced", "basics"]
+    assert server.stats["requests"] == 1
+
+    monkeypatch.setattr(Summarizer, "_available_topics", None)
+    assert Summarizer.fetch_available_topics(max_age=0) == ["advanced", "basics"]
+    assert server.stats["requests"] == 2
@@ -0,0 +1,45 @@
+import pytest
+import requests
+
+# Local imports
+from transport import HostStats, Transport
+
+
+@pytest.fixture
+def server(replay_server):
+    return replay_server({"basics": ["tutorial-1", "tutorial-2"]})
+
+
+def test_requests_have_the_default_timeout(server):
+    server.latency = 0.5
+    with Transport(timeout=0.1) as transport:
+        with pytest.raises(requests.Timeout):
+            transport.session.get(server.base_url + "/")
+        # Requests that set their own timeout are not affected
+        response = transport.session.get(server.base_url + "/", timeout=5)
+        assert response.status_code == 200
+
+
+def test_connections_are_reused_and_bytes_counted(server):
+    paths = ["/", "/tutorial-1/", "/tutorial-2/"]
+    with Transport(pool_size=1, contact="https://example.com") as transport:
+        responses = [transport.session.get(server.base_url + path) for path in paths]
+        stats = transport.stats()
+
+    assert responses[0].request.headers["User-Agent"].endswith(" https://example.com")
+    (host,) = stats
+    assert host == "127.0.0.1"
+    size = sum(len(response.content) for response in responses)
+    # Pages are served uncompressed
+    assert stats[host] == HostStats(
+        requests=3, connections=1, reused=2, bytes_on_wire=size, bytes_decoded=size
+    )
+
+
+@pytest.mark.parametrize("hedge_after, pool_size", [(None, 3), (1.0, 6)])
+def test_request_threads_match_the_connection_pool(
+    server, make_summarizer, hedge_after, pool_size
+):
+    s = make_summarizer(server, workers=3, hedge_after=hedge_after)
+    assert s.transport.pool_size == pool_size
+    assert s.request_executor._max_workers == pool_size
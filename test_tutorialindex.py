@@ -0,0 +1,70 @@
+from datetime import datetime
+
+# Local imports
+from records import Author, Card, Tag, card_record
+from tutorialindex import TutorialIndex
+
+
+def record(slug, tags, date=None, is_premium=False):
+    tags = tuple(Tag(name, f"/tutorials/{name}/") for name in tags)
+    card = Card(slug, f"/{slug}/", is_premium, date, tags)
+    return card_record(card, f"https://realpython.com/{slug}/")
+
+
+RECORDS = [
+    record("a", ["advanced", "docker"], datetime(2019, 1, 1)),
+    record("b", ["advanced"], datetime(2019, 3, 1)),
+    record("c", ["advanced", "docker"], datetime(2019, 3, 1), is_premium=True),
+    record("d", ["docker"]),
+    record("e", ["basics", "docker"], datetime(2018, 6, 1)),
+]
+
+
+def titles(records):
+    return [r.title for r in records]
+
+
+def test_tags_are_intersected():
+    index = TutorialIndex(RECORDS)
+    assert titles(index.query(tags=["advanced", "docker"])) == ["a", "c"]
+    assert titles(index.query(tags=["advanced", "unknown"])) == []
+    assert titles(index.query(any_tags=["basics", "advanced"])) == ["a", "b", "c", "e"]
+    assert titles(index.query(tags=["docker"], any_tags=["basics", "advanced"])) == [
+        "a",
+        "c",
+        "e",
+    ]
+    assert titles(index.query()) == ["a", "b", "c", "d", "e"]
+
+
+def test_dates_are_inclusive_and_exclude_undated_records():
+    index = TutorialIndex(RECORDS)
+    assert titles(index.query(since=datetime(2019, 1, 1))) == ["a", "b", "c"]
+    assert titles(index.query(until=datetime(2019, 1, 1))) == ["a", "e"]
+    march = datetime(2019, 3, 1)
+    assert titles(index.query(since=march, until=march)) == ["b", "c"]
+    assert titles(index.query(tags=["docker"], since=datetime(2018, 1, 1))) == [
+        "a",
+        "c",
+        "e",
+    ]
+
+
+def test_premium_filter():
+    index = TutorialIndex(RECORDS)
+    assert titles(index.query(tags=["docker"], premium=True)) == ["c"]
+    assert titles(index.query(tags=["docker"], premium=False)) == ["a", "d", "e"]
+
+
+def test_hydrated_records_replace_cards_and_index_authors():
+    index = TutorialIndex(RECORDS)
+    assert index.query(author="Someone") == []
+    hydrated = RECORDS[1]._replace(
+        author=Author("Someone", "/team/someone/"), markdown_introduction="Intro"
+    )
+    index.add(hydrated)
+    index.add(RECORDS[1])  # Unhydrated again, ignored
+    assert len(index) == len(RECORDS)
+    assert index[hydrated.url] is hydrated
+    assert index.query(tags=["advanced"], author="Someone") == [hydrated]
+    assert index.authors() == ["Someone"]
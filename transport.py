@@ -0,0 +1,129 @@
+"""The single HTTP transport used for every request of a Summarizer.
+
+Every request (home page, topic listings, articles and disqus count queries)
+goes through one `requests` session, so connections to each host are kept
+alive and reused by every worker instead of paying for a new TCP and TLS
+handshake. Responses are requested compressed and every request has a
+timeout. Once the requests cache is installed (see
+`summarizer.install_requests_cache`), the session is a cached session, and
+only requests that miss the cache reach the transport.
+"""
+
+import threading
+
+from collections import defaultdict, namedtuple
+from urllib.parse import urlsplit
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING, default_headers
+
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+HostStats = namedtuple(
+    "HostStats", "requests connections reused bytes_on_wire bytes_decoded"
+)
+
+
+class CountingAdapter(HTTPAdapter):
+    """HTTP adapter with a default timeout, that counts the bytes it receives.
+
+    `bytes_on_wire` is the size of response bodies as transferred (i.e.
+    compressed), and `bytes_decoded` their size once decompressed.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, **kwargs):
+        super().__init__(**kwargs)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._received = defaultdict(lambda: [0, 0])  # host -> [wire, decoded]
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+        response = super().send(request, stream=stream, timeout=timeout, **kwargs)
+        if not stream:
+            # Read the body now (the session would anyway), so that the number
+            # of bytes read from the connection is known
+            decoded = len(response.content)
+            with self._lock:
+                received = self._received[urlsplit(request.url).hostname]
+                received[0] += response.raw.tell()
+                received[1] += decoded
+        return response
+
+    def stats(self):
+        """Return the `HostStats` of every host requests were sent to."""
+        with self._lock:
+            received = {host: tuple(counts) for host, counts in self._received.items()}
+
+        # Connection pools count the requests they sent and the connections
+        # they opened; every other request reused an open connection
+        pools = self.poolmanager.pools
+        sent = defaultdict(lambda: [0, 0])
+        for key in pools.keys():
+            pool = pools[key]
+            sent[pool.host][0] += pool.num_requests
+            sent[pool.host][1] += pool.num_connections
+
+        stats = {}
+        for host in sorted(set(received) | set(sent)):
+            n_requests, connections = sent.get(host, (0, 0))
+            wire, decoded = received.get(host, (0, 0))
+            stats[host] = HostStats(
+                requests=n_requests,
+                connections=connections,
+                reused=max(n_requests - connections, 0),
+                bytes_on_wire=wire,
+                bytes_decoded=decoded,
+            )
+        return stats
+
+
+class Transport:
+    """A keep-alive, compressed `requests` session with pooled connections.
+
+    `pool_size` connections are kept open to each host, which should be at
+    least the number of threads sending requests concurrently. `timeout` is
+    used by every request that does not set its own. `contact` (e.g. a url)
+    is appended to the default User-Agent.
+    """
+
+    def __init__(self, pool_size=10, timeout=DEFAULT_TIMEOUT, contact=None):
+        assert isinstance(pool_size, int) and pool_size >= 1
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+        self.adapter = CountingAdapter(
+            timeout=timeout, pool_connections=10, pool_maxsize=pool_size
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        user_agent = default_headers()["User-Agent"]
+        if contact is not None:
+            user_agent = " ".join([user_agent, contact])
+        self.session.headers.update(
+            {
+                "User-Agent": user_agent,
+                "Accept-Encoding": DEFAULT_ACCEPT_ENCODING,
+                "Connection": "keep-alive",
+            }
+        )
+
+    def stats(self):
+        """Return the `HostStats` of each host (see `CountingAdapter.stats`)."""
+        return self.adapter.stats()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,129 @@
+import bisect
+import threading
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+# Local imports
+from records import TutorialRecord
+
+
+class TutorialIndex:
+    """In-memory index of tutorial records, for queries by tag, author and date.
+
+    Records are built from cards (see `Topic.records`), so tags, dates and
+    premium flags are known without fetching any article page. Authors are
+    only known for hydrated records; adding a hydrated record for a url that
+    is already indexed replaces the unhydrated one.
+
+    Query results are in the order the records were first added, which is
+    the order of the topic listings they came from.
+    """
+
+    def __init__(self, records: Iterable[TutorialRecord] = ()):
+        self._lock = threading.Lock()
+        self._records: List[TutorialRecord] = []
+        self._positions: Dict[str, int] = {}  # url -> position in _records
+        self._tags: Dict[str, Set[int]] = defaultdict(set)
+        self._authors: Dict[str, Set[int]] = defaultdict(set)
+        self._dates: List[tuple] = []  # Sorted (date, position) pairs
+        self._premium: Set[int] = set()
+        self.update(records)
+
+    def add(self, record: TutorialRecord):
+        with self._lock:
+            position = self._positions.get(record.url)
+            if position is None:
+                position = self._positions[record.url] = len(self._records)
+                self._records.append(record)
+                for tag in record.tags:
+                    self._tags[tag.name].add(position)
+                if record.date is not None:
+                    bisect.insort(self._dates, (record.date, position))
+                if record.is_premium:
+                    self._premium.add(position)
+            elif record.is_hydrated:
+                self._records[position] = record
+            else:
+                return
+            if record.author is not None:
+                self._authors[record.author.name].add(position)
+
+    def update(self, records: Iterable[TutorialRecord]):
+        for record in records:
+            self.add(record)
+
+    def query(
+        self,
+        tags: Iterable[str] = (),
+        any_tags: Iterable[str] = (),
+        author: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        premium: Optional[bool] = None,
+    ) -> List[TutorialRecord]:
+        """Return the records that match every given criterion.
+
+        `tags` must all be present, and at least one of `any_tags` (if any).
+        `author` only matches hydrated records. `since` and `until` are
+        inclusive, and exclude records without a date. `premium` restricts
+        results to premium (True) or free (False) tutorials.
+        """
+        with self._lock:
+            postings = [self._tags.get(tag, set()) for tag in tags]
+            any_tags = list(any_tags)
+            if any_tags:
+                postings.append(set().union(*(self._tags.get(t, ()) for t in any_tags)))
+            if author is not None:
+                postings.append(self._authors.get(author, set()))
+            if since is not None or until is not None:
+                postings.append(self._date_range(since, until))
+
+            # Intersect the smallest postings first
+            postings.sort(key=len)
+            if postings:
+                matches = set(postings[0])
+                for positions in postings[1:]:
+                    matches &= positions
+            else:
+                matches = set(range(len(self._records)))
+
+            if premium is not None:
+                if premium:
+                    matches &= self._premium
+                else:
+                    matches -= self._premium
+
+            return [self._records[position] for position in sorted(matches)]
+
+    def _date_range(self, since, until) -> Set[int]:
+        start = 0 if since is None else bisect.bisect_left(self._dates, (since,))
+        if until is None:
+            end = len(self._dates)
+        else:
+            # Positions are ints, so (until, inf) sorts after every (until, i)
+            end = bisect.bisect_right(self._dates, (until, float("inf")))
+        return {position for _, position in self._dates[start:end]}
+
+    def tag_names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._tags)
+
+    def authors(self) -> List[str]:
+        with self._lock:
+            return sorted(self._authors)
+
+    def __getitem__(self, url: str) -> TutorialRecord:
+        with self._lock:
+            return self._records[self._positions[url]]
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._positions
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._records))
+
+    def __len__(self):
+        return len(self._records)